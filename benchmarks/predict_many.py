@@ -0,0 +1,100 @@
+"""
+Benchmark the thread scaling of `FrozenClassifier.predict_many`.
+
+Trains a classifier on a synthetic pre-tokenized corpus (no spaCy model
+needed), freezes it, and scores the same pre-tokenized documents with an
+increasing number of threads. On free-threaded CPython (e.g. `python3.13t`
+with PYTHON_GIL=0) throughput should scale close to linearly with cores;
+with the GIL, the speedup is limited to the vectorized parts of scoring.
+
+Usage:
+    python benchmarks/predict_many.py [--documents N] [--categories C] [--repeat R]
+"""
+
+import argparse
+import os
+import random
+from time import perf_counter
+
+from text_classifier import Classifier
+from text_classifier.corpus import TokenizedCorpus
+from text_classifier.frozen import gil_enabled
+
+
+def synthetic_documents(
+    count: int, vocab_size: int, categories: int, seed: int
+) -> list[tuple[list[str], str]]:
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(vocab_size)]
+
+    documents = []
+    for _ in range(count):
+        category = rng.randrange(categories)
+        # every category favours its own slice of the vocabulary
+        topic = words[category::categories]
+        length = rng.randint(5, 60)
+        documents.append(
+            (
+                [
+                    rng.choice(topic if rng.random() < 0.6 else words)
+                    for _ in range(length)
+                ],
+                f"category-{category}",
+            )
+        )
+
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=50_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--dtype", default="float32")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    training = synthetic_documents(
+        args.documents, args.vocabulary, args.categories, seed=0
+    )
+    c = Classifier()
+    c.train(TokenizedCorpus.from_tokenized(training))
+    model = c.freeze(args.dtype)
+
+    documents = [
+        words
+        for words, _ in synthetic_documents(
+            args.documents, args.vocabulary, args.categories, seed=1
+        )
+    ]
+
+    cpus = os.cpu_count() or 1
+    thread_counts = sorted({1, 2, 4, 8, 16, cpus} & set(range(1, cpus + 1)))
+
+    print(f"GIL enabled: {gil_enabled()}, CPUs: {cpus}, dtype: {args.dtype}")
+    print(f"{'threads':>8} {'docs/s':>12} {'speedup':>8} {'efficiency':>10}")
+
+    baseline = None
+    for threads in thread_counts:
+        # warm up, then keep the best of several runs
+        model.predict_many(documents[: args.batch_size * threads], threads)
+
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = perf_counter()
+            model.predict_many(documents, threads, args.batch_size)
+            best = min(best, perf_counter() - start)
+
+        throughput = len(documents) / best
+        baseline = baseline or throughput
+        speedup = throughput / baseline
+
+        print(
+            f"{threads:>8} {throughput:>12,.0f} {speedup:>8.2f} {speedup / threads:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
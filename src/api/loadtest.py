@@ -0,0 +1,364 @@
+"""
+Load-testing harness for the classifier API.
+
+Replays a JSONL request log, or synthesized traffic, against the app and
+reports throughput, latency percentiles and error rates. Requests are sent
+either in-process through an ASGI transport (no network or server needed),
+or to a running server such as a local uvicorn.
+
+Every line of a request log is a JSON object. Objects with a "path" key are
+replayed as-is (with optional "method" and "json" keys), any other object is
+sent to `/predict/` with the text found under the configured field.
+
+Usage:
+    python -m api.loadtest --log requests.jsonl --field body --concurrency 16
+    python -m api.loadtest --synthesize 2000 --rate 200 --url http://127.0.0.1:8000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Iterable
+
+import httpx
+import numpy as np
+
+# fields searched for the message text of a logged request, in order
+DEFAULT_TEXT_FIELDS = ("text", "body")
+
+# vocabulary of synthesized messages, a mix of legit and spammy words
+_SYNTHETIC_WORDS = (
+    "hey are we still meeting for lunch tomorrow at noon call me when you "
+    "get home the train is late sorry running behind see you at the office "
+    "free entry win cash prize claim now urgent reply txt stop to opt out "
+    "congratulations you have won a guaranteed award call this number today"
+).split()
+
+
+@dataclass(frozen=True)
+class LoadRequest:
+    """
+    A single HTTP request to send to the app.
+    """
+
+    method: str
+    path: str
+    json: Any = None
+
+
+@dataclass
+class LoadTestReport:
+    """
+    The results of a load test.
+
+    Attributes:
+        duration (float): wall-clock duration of the test, in seconds.
+
+        latencies (list[float]): latency of every request, in seconds. With a
+            fixed arrival rate, latencies are measured from the scheduled
+            arrival time, so they include the time spent waiting for a free
+            connection slot.
+
+        statuses (Counter[int | None]): number of responses per HTTP status,
+            None counting the requests that failed without a response.
+    """
+
+    duration: float
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter[int | None] = field(default_factory=Counter)
+
+    @property
+    def requests(self) -> int:
+        """
+        The number of requests sent.
+        """
+        return len(self.latencies)
+
+    @property
+    def errors(self) -> int:
+        """
+        The number of requests that failed, or returned an error status.
+        """
+        return sum(
+            count
+            for status, count in self.statuses.items()
+            if status is None or status >= 400
+        )
+
+    @property
+    def error_rate(self) -> float:
+        """
+        The fraction of requests that failed, or returned an error status.
+        """
+        return self.errors / self.requests if self.requests else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """
+        Completed requests per second.
+        """
+        return self.requests / self.duration if self.duration else 0.0
+
+    def percentile(self, q: float) -> float:
+        """
+        Obtains a latency percentile, in seconds.
+
+        Args:
+            q: the percentile to compute, between 0 and 100
+
+        Returns:
+            the q-th percentile of the request latencies
+        """
+        return float(np.percentile(self.latencies, q)) if self.latencies else 0.0
+
+    def summary(self) -> str:
+        """
+        Format the report as human-readable text.
+
+        Returns:
+            a multi-line summary of the report
+        """
+        milliseconds = {q: self.percentile(q) * 1000 for q in (50, 90, 99, 100)}
+
+        return "\n".join(
+            [
+                f"requests:    {self.requests} in {self.duration:.2f}s",
+                f"throughput:  {self.throughput:.1f} req/s",
+                f"latency ms:  p50={milliseconds[50]:.1f} p90={milliseconds[90]:.1f} "
+                f"p99={milliseconds[99]:.1f} max={milliseconds[100]:.1f}",
+                f"errors:      {self.errors} ({self.error_rate:.2%})",
+                f"statuses:    {dict(self.statuses)}",
+            ]
+        )
+
+
+def parse_request(
+    record: dict[str, Any], text_fields: Iterable[str] = DEFAULT_TEXT_FIELDS
+) -> LoadRequest:
+    """
+    Convert a request log record into a request.
+
+    Args:
+        record: a JSON object from the request log
+        text_fields: fields searched for the message text, in order
+
+    Returns:
+        the request to send
+    """
+    if "path" in record:
+        return LoadRequest(
+            method=record.get("method", "POST"),
+            path=record["path"],
+            json=record.get("json"),
+        )
+
+    for name in text_fields:
+        if name in record:
+            return LoadRequest("POST", "/predict/", {"text": str(record[name])})
+
+    raise ValueError(f"record has none of the text fields {tuple(text_fields)}")
+
+
+def load_requests(
+    path: str, text_fields: Iterable[str] = DEFAULT_TEXT_FIELDS
+) -> list[LoadRequest]:
+    """
+    Read the requests of a JSONL request log.
+
+    Args:
+        path: the path of the request log
+        text_fields: fields searched for the message text, in order
+
+    Returns:
+        the logged requests, in order
+    """
+    text_fields = tuple(text_fields)
+
+    with open(path) as f:
+        return [
+            parse_request(json.loads(line), text_fields) for line in f if line.strip()
+        ]
+
+
+def synthesize_requests(count: int, seed: int = 0) -> list[LoadRequest]:
+    """
+    Generate random prediction requests.
+
+    Args:
+        count: the number of requests to generate
+        seed: seed of the random generator
+
+    Returns:
+        `count` requests to `/predict/` with messages of 5 to 40 words
+    """
+    rng = random.Random(seed)
+
+    return [
+        LoadRequest(
+            "POST",
+            "/predict/",
+            {"text": " ".join(rng.choices(_SYNTHETIC_WORDS, k=rng.randint(5, 40)))},
+        )
+        for _ in range(count)
+    ]
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    requests: list[LoadRequest],
+    concurrency: int = 8,
+    rate: float | None = None,
+    seed: int = 0,
+) -> LoadTestReport:
+    """
+    Send requests to the app and measure their latencies.
+
+    Args:
+        client: the client to send the requests with
+        requests: the requests to send, in order
+        concurrency: the maximum number of requests in flight
+        rate: the mean arrival rate in requests per second, with exponentially
+            distributed inter-arrival times (open loop). When None, requests are
+            sent back to back by `concurrency` workers (closed loop).
+        seed: seed of the random arrival times
+
+    Returns:
+        the report of the load test
+    """
+    slots = asyncio.Semaphore(concurrency)
+    report = LoadTestReport(duration=0.0)
+
+    async def send(request: LoadRequest, scheduled: float):
+        async with slots:
+            try:
+                response = await client.request(
+                    request.method, request.path, json=request.json
+                )
+                status: int | None = response.status_code
+            except Exception:
+                # a failed request is counted as an error, and must not
+                # abort the other requests of the test
+                status = None
+
+        report.latencies.append(perf_counter() - scheduled)
+        report.statuses[status] += 1
+
+    start = perf_counter()
+
+    if rate is None:
+        pending = iter(requests)
+
+        async def worker():
+            # workers share the iterator, each takes the next request when idle
+            for request in pending:
+                await send(request, perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        rng = random.Random(seed)
+        arrival = start
+        tasks = []
+
+        for request in requests:
+            arrival += rng.expovariate(rate)
+            await asyncio.sleep(max(0.0, arrival - perf_counter()))
+            tasks.append(asyncio.create_task(send(request, arrival)))
+
+        await asyncio.gather(*tasks)
+
+    report.duration = perf_counter() - start
+
+    return report
+
+
+def make_client(url: str | None = None, timeout: float = 30.0) -> httpx.AsyncClient:
+    """
+    Create a client for the app.
+
+    Args:
+        url: the base URL of a running server, or None to run the app
+            in-process through an ASGI transport
+        timeout: the request timeout, in seconds
+
+    Returns:
+        the client to send requests with
+    """
+    if url is not None:
+        return httpx.AsyncClient(base_url=url, timeout=timeout)
+
+    # importing the app trains the model, so only do it when needed
+    from .main import app
+
+    # unhandled exceptions of the app are returned as 500 responses, as a
+    # server would, instead of being raised into the harness
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+        base_url="http://testserver",
+        timeout=timeout,
+    )
+
+
+async def _main(args: argparse.Namespace):
+    if args.log is not None:
+        requests = load_requests(args.log, args.field or DEFAULT_TEXT_FIELDS)
+    else:
+        requests = synthesize_requests(args.synthesize, args.seed)
+
+    if args.requests is not None and requests:
+        # cycle through the source requests until the target count is reached
+        requests = [requests[i % len(requests)] for i in range(args.requests)]
+
+    async with make_client(args.url) as client:
+        if args.warmup:
+            await run_load(client, requests[: args.warmup], args.concurrency)
+
+        report = await run_load(
+            client, requests, args.concurrency, args.rate, args.seed
+        )
+
+    print(report.summary())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m api.loadtest", description=__doc__.split("\n\n")[0]
+    )
+
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--log", help="JSONL request log to replay")
+    source.add_argument(
+        "--synthesize", type=int, metavar="N", help="send N synthesized requests"
+    )
+
+    parser.add_argument(
+        "--field",
+        action="append",
+        help="field holding the message text in log records, may be repeated "
+        f"(default: {', '.join(DEFAULT_TEXT_FIELDS)})",
+    )
+    parser.add_argument(
+        "--url", help="base URL of a running server (default: in-process ASGI)"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="maximum requests in flight"
+    )
+    parser.add_argument(
+        "--rate", type=float, help="mean arrival rate in req/s (default: closed loop)"
+    )
+    parser.add_argument(
+        "--requests", type=int, help="total requests to send, cycling the source"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=0, help="unmeasured requests sent first"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
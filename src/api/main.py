@@ -1,11 +1,16 @@
+import os
+
 from datasets import load_dataset
 from fastapi import FastAPI
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from text_classifier import Classifier
+from text_classifier.cascade import CascadeClassifier
+from text_classifier.corpus import load_or_build
 
-from .models import UserInputText
+from .models import StreamingInputText, UserInputText
+from .registry import ModelRegistry, make_router
 
 app = FastAPI()
 
@@ -23,9 +28,24 @@ for entry in training_ds:
         label = label_map[entry.get("label", -1)]
         docs.append((doc, label))
 
+# tokenize the training set once, and reuse the cached tokens on later runs
+corpus = load_or_build(docs, os.environ.get("TEXT_CLASSIFIER_CACHE", ".cache/corpus"))
+
 c = Classifier()
 
-c.train(docs)
+c.train(corpus)
+
+# answers confident messages with a cheap tokenizer, and falls back to spaCy
+# for the rest; a small sample of confident answers is audited for agreement
+cascade = CascadeClassifier(c, threshold=0.99, audit_rate=0.01)
+
+# every classifier served by this process, sharing one spaCy model
+DEFAULT_MODEL = "spam"
+
+registry = ModelRegistry()
+registry.register(DEFAULT_MODEL, c)
+
+app.include_router(make_router(registry))
 
 
 @app.get("/")
@@ -42,3 +62,47 @@ def categories():
 async def predict(data: UserInputText):
     text = data.text
     return c.predict(text)
+
+
+# tokenizing handlers are async, so that they don't call the shared spaCy
+# pipeline from several threads of FastAPI's thread pool at once
+@app.post("/predict/cascade/")
+async def predict_cascade(data: UserInputText):
+    return cascade.predict(data.text)
+
+
+@app.get("/stats/cascade")
+def cascade_stats():
+    stats = cascade.stats
+
+    return {
+        "requests": stats.requests,
+        "fall_through_rate": stats.fall_through_rate,
+        # the agreement rate of served fast-stage answers, over `audits` samples
+        "audits": stats.audits,
+        "audit_agreement_rate": stats.audit_agreement_rate,
+        "fall_through_agreement_rate": stats.fall_through_agreement_rate,
+        "mean_latency": stats.mean_latency,
+        "mean_full_latency": stats.mean_full_latency,
+        "latency_saving": stats.latency_saving,
+    }
+
+
+@app.post("/predict/stream/")
+async def predict_stream(data: StreamingInputText):
+    # chunked scoring keeps the cost of very long inputs bounded
+    result = c.predict_stream(
+        data.text,
+        chunk_size=data.chunk_size,
+        confidence_margin=data.confidence_margin,
+        token_budget=data.token_budget,
+        char_budget=data.char_budget,
+    )
+
+    return {
+        "probabilities": result.probabilities,
+        "tokens_consumed": result.tokens_consumed,
+        "chars_consumed": result.chars_consumed,
+        "fraction_consumed": result.fraction_consumed,
+        "stop_reason": result.stop_reason,
+    }
@@ -1,5 +1,32 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class UserInputText(BaseModel):
     text: str
+
+
+# server-side limits of a streaming prediction, which bound its cost
+# whatever the length of the text
+MAX_CHUNK_SIZE = 16_384
+MAX_TOKEN_BUDGET = 20_000
+MAX_CHAR_BUDGET = 200_000
+
+
+class StreamingInputText(UserInputText):
+    # characters tokenized at a time
+    chunk_size: int = Field(default=4096, gt=0, le=MAX_CHUNK_SIZE)
+
+    # stop once the top category is exp(margin) times more probable than the runner-up
+    confidence_margin: float | None = Field(default=20.0, gt=0)
+
+    # maximum number of word tokens scored per request
+    token_budget: int = Field(default=MAX_TOKEN_BUDGET, gt=0, le=MAX_TOKEN_BUDGET)
+
+    # maximum number of characters tokenized per request, which bounds the work
+    # even when few of the tokens are words that count against the token budget
+    char_budget: int = Field(default=MAX_CHAR_BUDGET, gt=0, le=MAX_CHAR_BUDGET)
+
+
+class FanOutInputText(UserInputText):
+    # names of the models to score the text with, defaults to every model
+    models: list[str] | None = None
@@ -0,0 +1,150 @@
+"""
+This module contains the registry of the classifiers served by the API.
+
+Several named classifiers are hosted in one process, and share both the
+natural language model and the tokenization of every request: a fan-out
+prediction tokenizes the input once and scores the same words against
+every requested classifier.
+"""
+
+from typing import Iterable
+
+from fastapi import APIRouter, HTTPException
+
+from text_classifier import Classifier
+from text_classifier.parser import parse_words
+
+from .models import FanOutInputText, UserInputText
+
+
+class ModelRegistry:
+    """
+    A collection of trained classifiers, addressed by name.
+    """
+
+    def __init__(self):
+        self._models: dict[str, Classifier] = {}
+
+    def register(self, name: str, classifier: Classifier):
+        """
+        Add a trained classifier to the registry.
+
+        Args:
+            name: the name the classifier is served under
+            classifier: the trained classifier
+        """
+        if name in self._models:
+            raise ValueError(f"a model named {name!r} is already registered")
+
+        self._models[name] = classifier
+
+    def get(self, name: str) -> Classifier:
+        """
+        Obtains a registered classifier.
+
+        Args:
+            name: the name the classifier is served under
+
+        Returns:
+            the classifier registered under `name`
+
+        Raises:
+            KeyError: if no classifier is registered under `name`
+        """
+        return self._models[name]
+
+    def names(self) -> list[str]:
+        """
+        Lists the registered classifiers.
+
+        Returns:
+            the names of the registered classifiers, in registration order
+        """
+        return list(self._models)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._models
+
+    def predict(self, name: str, text: str) -> dict[str, float]:
+        """
+        Predict category probabilities with a single classifier.
+
+        Args:
+            name: the name of the classifier to use
+            text: input text string
+
+        Returns:
+            dict mapping category -> probability
+        """
+        return self.get(name).predict(text)
+
+    def predict_all(
+        self, text: str, names: Iterable[str] | None = None
+    ) -> dict[str, dict[str, float]]:
+        """
+        Predict category probabilities with several classifiers, tokenizing the input once.
+
+        Args:
+            text: input text string
+            names: the classifiers to use, defaults to every registered classifier
+
+        Returns:
+            dict mapping classifier name -> (category -> probability)
+
+        Raises:
+            KeyError: if one of `names` isn't registered
+        """
+        models = [(n, self.get(n)) for n in (self.names() if names is None else names)]
+
+        words = parse_words(text)
+
+        return {name: model.predict_words(words) for name, model in models}
+
+
+def make_router(registry: ModelRegistry) -> APIRouter:
+    """
+    Create the API routes serving the classifiers of a registry.
+
+    Every named classifier is served under its own `/models/{model}/` prefix,
+    so model names can't clash with the fixed `/predict/*` routes.
+
+    The handlers are `async`, like the app's `/predict/` route, so they run on
+    the event loop one at a time instead of in FastAPI's thread pool: the
+    spaCy pipeline used to tokenize requests isn't safe to share across threads.
+
+    Args:
+        registry: the registry of the classifiers to serve
+
+    Returns:
+        the router to include in the app
+    """
+    router = APIRouter()
+
+    def get_model(name: str) -> Classifier:
+        if name not in registry:
+            raise HTTPException(status_code=404, detail=f"Unknown model: {name}")
+
+        return registry.get(name)
+
+    @router.get("/models")
+    async def models():
+        return registry.names()
+
+    @router.post("/models/{model}/predict")
+    async def predict_model(model: str, data: UserInputText):
+        return get_model(model).predict(data.text)
+
+    @router.get("/models/{model}/memory")
+    async def model_memory(model: str):
+        return get_model(model).memory_report().to_dict()
+
+    @router.post("/predict/fanout/")
+    async def predict_fanout(data: FanOutInputText):
+        unknown = [name for name in data.models or [] if name not in registry]
+
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Unknown models: {unknown}")
+
+        return registry.predict_all(data.text, data.models)
+
+    return router
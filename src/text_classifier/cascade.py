@@ -0,0 +1,238 @@
+"""
+This module contains a two-tier prediction cascade.
+
+Most messages are obviously in one category, and don't need the full
+natural language model to be classified. The cascade first scores a
+document with a cheap regular-expression tokenizer and the same Naive Bayes
+tables, and returns immediately when the top category's posterior clears a
+confidence threshold. Only the documents in the uncertain band fall through
+to the full `parse_words` tokenization.
+"""
+
+import random
+from dataclasses import dataclass, replace
+from threading import Lock
+from time import perf_counter
+
+from .classifier import Classifier
+from .parser import fast_parse_words, parse_words
+
+
+@dataclass(frozen=True)
+class CascadeStats:
+    """
+    Counters describing how a cascade handled its traffic.
+
+    Attributes:
+        requests (int): the number of predictions made.
+
+        fall_throughs (int): predictions the fast stage wasn't confident
+            about, and that were computed by the full stage.
+
+        audits (int): confident fast-stage predictions that were also
+            computed by the full stage, to measure their agreement.
+
+        fall_through_agreements (int): the number of fall-throughs where the
+            fast and full stages predicted the same top category.
+
+        audit_agreements (int): the number of audits where the fast and full
+            stages predicted the same top category.
+
+        fast_seconds (float): time spent in the fast stage.
+
+        full_seconds (float): time spent in the full stage, audits included.
+
+        audit_seconds (float): the part of `full_seconds` spent on audits.
+    """
+
+    requests: int = 0
+    fall_throughs: int = 0
+    audits: int = 0
+    fall_through_agreements: int = 0
+    audit_agreements: int = 0
+    fast_seconds: float = 0.0
+    full_seconds: float = 0.0
+    audit_seconds: float = 0.0
+
+    @property
+    def fall_through_rate(self) -> float:
+        """
+        The fraction of predictions that needed the full stage.
+        """
+        return self.fall_throughs / self.requests if self.requests else 0.0
+
+    @property
+    def audit_agreement_rate(self) -> float:
+        """
+        The fraction of audited confident predictions where the full stage agreed
+        with the fast stage on the top category.
+
+        Audited answers are the fast-stage answers the cascade actually serves, so
+        this estimates how often a confident fast-stage answer is wrong.
+        """
+        return self.audit_agreements / self.audits if self.audits else 1.0
+
+    @property
+    def fall_through_agreement_rate(self) -> float:
+        """
+        The fraction of fall-throughs where the fast stage's discarded answer agreed
+        with the full stage on the top category.
+        """
+        if not self.fall_throughs:
+            return 1.0
+
+        return self.fall_through_agreements / self.fall_throughs
+
+    @property
+    def mean_latency(self) -> float:
+        """
+        The mean time of a cascade prediction, in seconds, excluding audits.
+        """
+        if not self.requests:
+            return 0.0
+
+        serving_seconds = self.fast_seconds + self.full_seconds - self.audit_seconds
+        return serving_seconds / self.requests
+
+    @property
+    def mean_full_latency(self) -> float:
+        """
+        The mean time of a full-stage prediction, in seconds.
+        """
+        full_runs = self.fall_throughs + self.audits
+        return self.full_seconds / full_runs if full_runs else 0.0
+
+    @property
+    def latency_saving(self) -> float:
+        """
+        The estimated fraction of mean latency saved compared with always running
+        the full stage.
+        """
+        if not self.mean_full_latency:
+            return 0.0
+
+        return 1.0 - self.mean_latency / self.mean_full_latency
+
+
+class CascadeClassifier:
+    """
+    A cheap-first prediction cascade over a trained `Classifier`.
+
+    Args:
+        classifier (Classifier): the trained classifier, whose tables are used by both stages.
+
+        threshold (float): the minimum top-category probability for the fast stage to
+            return its prediction. Defaults to 0.99.
+
+        audit_rate (float): the fraction of confident fast-stage predictions that are
+            also computed by the full stage, to measure how often the fast stage is
+            wrong when it is confident. Defaults to 0.0.
+
+        seed (int | None): seed of the audit sampling.
+    """
+
+    def __init__(
+        self,
+        classifier: Classifier,
+        threshold: float = 0.99,
+        audit_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        if not 0.0 <= audit_rate <= 1.0:
+            raise ValueError("audit_rate must be between 0 and 1")
+
+        self.classifier = classifier
+        self.threshold = threshold
+        self.audit_rate = audit_rate
+
+        self._random = random.Random(seed)
+        self._stats = CascadeStats()
+        self._lock = Lock()
+
+    @property
+    def stats(self) -> CascadeStats:
+        """
+        A snapshot of the cascade's counters.
+        """
+        with self._lock:
+            return self._stats
+
+    def reset_stats(self):
+        """
+        Reset the cascade's counters.
+        """
+        with self._lock:
+            self._stats = CascadeStats()
+
+    def predict(self, doc: str) -> dict[str, float]:
+        """
+        Predict category probabilities for the input document.
+
+        Args:
+            doc: input text string
+
+        Returns:
+            dict mapping category -> probability, from the fast stage if it is
+            confident, from the full stage otherwise
+        """
+        start = perf_counter()
+        fast = self.classifier.predict_words(fast_parse_words(doc))
+        fast_seconds = perf_counter() - start
+
+        confident = max(fast.values()) >= self.threshold
+
+        with self._lock:
+            audit = confident and self._random.random() < self.audit_rate
+
+        if confident and not audit:
+            self._record(fast_seconds=fast_seconds)
+            return fast
+
+        start = perf_counter()
+        full = self.classifier.predict_words(parse_words(doc))
+        full_seconds = perf_counter() - start
+
+        self._record(
+            fast_seconds=fast_seconds,
+            full_seconds=full_seconds,
+            fall_through=not confident,
+            audit=audit,
+            agreement=max(fast, key=fast.__getitem__)
+            == max(full, key=full.__getitem__),
+        )
+
+        # audited requests are still answered by the fast stage
+        return fast if audit else full
+
+    def _record(
+        self,
+        fast_seconds: float,
+        full_seconds: float = 0.0,
+        fall_through: bool = False,
+        audit: bool = False,
+        agreement: bool = False,
+    ):
+        """
+        Update the cascade's counters with the outcome of a prediction.
+
+        Args:
+            fast_seconds: time spent in the fast stage
+            full_seconds: time spent in the full stage, if it ran
+            fall_through: whether the fast stage wasn't confident
+            audit: whether a confident prediction was audited by the full stage
+            agreement: whether both stages predicted the same top category
+        """
+        with self._lock:
+            stats = self._stats
+            self._stats = replace(
+                stats,
+                requests=stats.requests + 1,
+                fall_throughs=stats.fall_throughs + fall_through,
+                audits=stats.audits + audit,
+                fall_through_agreements=stats.fall_through_agreements
+                + (fall_through and agreement),
+                audit_agreements=stats.audit_agreements + (audit and agreement),
+                fast_seconds=stats.fast_seconds + fast_seconds,
+                full_seconds=stats.full_seconds + full_seconds,
+                audit_seconds=stats.audit_seconds + (full_seconds if audit else 0.0),
+            )
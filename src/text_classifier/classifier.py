@@ -1,9 +1,16 @@
+from dataclasses import dataclass
 from math import exp, log
 from typing import Mapping
 
-from .features import Vocabulary, WordBag
+import numpy as np
+
+from .corpus import TokenizedCorpus
+from .features import Vocabulary, WordBag, ngrams
+from .frozen import FrozenClassifier
 from .logger import get_logger
-from .parser import parse_words
+from .memory import MemoryReport, memory_report
+from .parser import iter_chunks, parse_word_spans, parse_words
+from .sketch import CountMinSketch, hash_features
 
 logger = get_logger(__name__)
 
@@ -29,12 +36,57 @@ class WordLikelihood(dict[str, float]):
         self.vocab_size = vocab_size
         self.k = k
 
+    @property
+    def unseen_likelihood(self) -> float:
+        """
+        The smoothed likelihood of a word that never occurred in the category.
+
+        Returns:
+            float: k / (total_words + k * vocab_size)
+        """
+        return self.k / (self.total_words + (self.k * self.vocab_size))
+
     def __getitem__(self, key: str) -> float:
         if key in self:
             return super().__getitem__(key)
         else:
             # lazily calculate unseen word probability on demand
-            return self.k / (self.total_words + (self.k * self.vocab_size))
+            return self.unseen_likelihood
+
+
+@dataclass(frozen=True)
+class StreamingPrediction:
+    """
+    The result of a chunked prediction over a (possibly partially read) document.
+
+    Attributes:
+        probabilities (dict[str, float]): category probabilities, given the
+            consumed part of the document.
+
+        tokens_consumed (int): the number of word tokens scored.
+
+        chars_consumed (int): the number of characters of the document scored,
+            up to the end of the last word scored when the token budget ran out.
+
+        total_chars (int): the length of the document.
+
+        stop_reason (str): why scoring stopped: "confidence" when the margin
+            was reached, "token_budget" or "char_budget" when one of the budgets
+            ran out, or "exhausted" when the whole document was scored.
+    """
+
+    probabilities: dict[str, float]
+    tokens_consumed: int
+    chars_consumed: int
+    total_chars: int
+    stop_reason: str
+
+    @property
+    def fraction_consumed(self) -> float:
+        """
+        The fraction of the document's characters that were read.
+        """
+        return self.chars_consumed / self.total_chars if self.total_chars else 1.0
 
 
 class Classifier:
@@ -53,9 +105,35 @@ class Classifier:
         total_words_per_category (dict[str, int]): Total word count per category.
 
         word_likelihoods_per_category (dict[str, dict[str, float]]): Word likelihoods-per-category, aka P(word|category).
+
+        ngram_sketches_per_category (dict[str, CountMinSketch]): Word n-gram counts-per-category,
+            only populated when `ngram_size` > 1.
+
+    Args:
+        ngram_size (int): The highest word n-gram order used as a feature. Unigrams are
+            always counted exactly; orders 2 through `ngram_size` are counted in
+            per-category count-min sketches. Defaults to 1 (unigrams only).
+
+        sketch_width (int): The number of counters per row of each n-gram sketch.
+
+        sketch_depth (int): The number of rows of each n-gram sketch.
+
+    Note:
+        Each n-gram sketch takes a fixed `sketch_width * sketch_depth * 8` bytes,
+        regardless of the size of the training corpus. Its estimated counts exceed
+        the true counts by at most `e / sketch_width` of the category's n-gram total,
+        with probability at least `1 - exp(-sketch_depth)` (see `text_classifier.sketch`).
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        ngram_size: int = 1,
+        sketch_width: int = 2**16,
+        sketch_depth: int = 4,
+    ):
+        if ngram_size < 1:
+            raise ValueError("ngram_size must be at least 1")
+
         # store model vocabulary
         self._vocab = Vocabulary()
 
@@ -71,6 +149,16 @@ class Classifier:
         # store word likelihoods-per-category, aka P(word|category)
         self._likelihoods: dict[str, WordLikelihood] = {}
 
+        # n-gram features, counted in fixed-size sketches
+        self._ngram_size = ngram_size
+        self._sketch_width = sketch_width
+        self._sketch_depth = sketch_depth
+        self._ngram_sketches: dict[str, CountMinSketch] = {}
+
+        # estimated number of distinct n-grams, and the n-gram smoothing parameter
+        self._ngram_vocab_size = 0
+        self._ngram_k = 1.0
+
     @property
     def vocabulary(self) -> Vocabulary:
         """
@@ -101,6 +189,20 @@ class Classifier:
         """
         return self._priors
 
+    @property
+    def word_frequencies_per_category(self) -> dict[str, dict[str, int]]:
+        """
+        A dictionary mapping category labels to their raw word counts.
+
+        Only words that occur at least once in a category are present in
+        that category's mapping.
+
+        Returns:
+            dict[str, dict[str, int]]: a dictionary mapping category labels to their
+                respective word counts
+        """
+        return self._word_freq_per_category
+
     @property
     def word_likelihoods_per_category(self) -> dict[str, WordLikelihood]:
         """
@@ -118,6 +220,19 @@ class Classifier:
         """
         return self._likelihoods
 
+    @property
+    def ngram_sketches_per_category(self) -> dict[str, CountMinSketch]:
+        """
+        A dictionary mapping category labels to their word n-gram count sketches.
+
+        Empty unless the classifier was created with `ngram_size` > 1.
+
+        Returns:
+            dict[str, CountMinSketch]: a dictionary mapping category labels to their
+                respective n-gram count sketches
+        """
+        return self._ngram_sketches
+
     @property
     def categories(self) -> tuple[str, ...]:
         """
@@ -162,39 +277,110 @@ class Classifier:
             else:
                 self._word_freq_per_category.setdefault(category, {word: 1})
 
+    def _build_category_ngram_counts(self, words: list[str], category: str):
+        """
+        Records the word n-grams of a document in its category's sketch.
+
+        Args:
+            words (list[str]): the ordered words of the document
+            category (str): the category the document belongs to
+        """
+        grams = WordBag(ngrams(words, self._ngram_size))
+
+        if not grams:
+            return
+
+        if category not in self._ngram_sketches:
+            self._ngram_sketches[category] = CountMinSketch(
+                width=self._sketch_width, depth=self._sketch_depth
+            )
+
+        self._ngram_sketches[category].add(
+            hash_features(grams.keys()),
+            np.fromiter(grams.values(), dtype=np.int64, count=len(grams)),
+        )
+
+    def _build_corpus_counts(self, corpus: TokenizedCorpus) -> dict[str, int]:
+        """
+        Builds the vocabulary and per-category word counts of a pre-tokenized corpus.
+
+        The counts are built with a single `np.bincount` over the corpus token ids,
+        and only the nonzero (category, word) counts are copied into the
+        classifier's `_word_freq_per_category` attribute.
+
+        Args:
+            corpus (TokenizedCorpus): the pre-tokenized training corpus
+
+        Returns:
+            dict[str, int]: the number of documents of every category
+        """
+        # corpus words are numbered in order of first appearance, which
+        # is the order the vocabulary would have registered them in
+        self._vocab.register(corpus.words)
+
+        words = np.array(corpus.words, dtype=object)
+        word_counts = corpus.word_counts()
+
+        for category, row in zip(corpus.categories, word_counts):
+            nonzero = np.flatnonzero(row)
+
+            if len(nonzero) == 0:
+                continue
+
+            category_counts = self._word_freq_per_category.setdefault(category, {})
+
+            for word, freq in zip(words[nonzero], row[nonzero].tolist()):
+                category_counts[word] = category_counts.get(word, 0) + freq
+
+        if self._ngram_size > 1:
+            for i, label in enumerate(corpus.labels.tolist()):
+                self._build_category_ngram_counts(
+                    [corpus.words[t] for t in corpus.document(i)],
+                    corpus.categories[label],
+                )
+
+        return dict(zip(corpus.categories, corpus.document_counts().tolist()))
+
     def train(
         self,
-        dataset: list[tuple[str, str]],
+        dataset: list[tuple[str, str]] | TokenizedCorpus,
         k: float = 1.0,
     ):
         """
         Train a classifier using a given dataset.
 
         Args:
-            dataset (list[tuple[str, str]]): A list of tuples where the first element
-                is a document and the second element is the category the document belongs to.
+            dataset (list[tuple[str, str]] | TokenizedCorpus): A list of tuples where the
+                first element is a document and the second element is the category the
+                document belongs to, or the same documents already tokenized into a corpus.
             k (float): The smoothing parameter for Laplace smoothing. Defaults to 1.0.
         """
         total_doc_count = len(dataset)
         docs_per_category: dict[str, int] = {}
 
-        # build vocabulary and per-category word counts
-        for doc, label in dataset:
-            # clean the label in case the dataset is inconsistent
-            label = label.lower()
+        if isinstance(dataset, TokenizedCorpus):
+            docs_per_category = self._build_corpus_counts(dataset)
+        else:
+            # build vocabulary and per-category word counts
+            for doc, label in dataset:
+                # clean the label in case the dataset is inconsistent
+                label = label.lower()
 
-            # count number of docs-per-category to compute priors
-            if label in docs_per_category:
-                docs_per_category[label] += 1
-            else:
-                docs_per_category[label] = 1
+                # count number of docs-per-category to compute priors
+                if label in docs_per_category:
+                    docs_per_category[label] += 1
+                else:
+                    docs_per_category[label] = 1
+
+                words = parse_words(doc)
 
-            words = parse_words(doc)
+                self._vocab.register(words)
 
-            self._vocab.register(words)
+                # count occurrences of a word in a given category
+                self._build_category_word_counts([(w, label) for w in words])
 
-            # count occurrences of a word in a given category
-            self._build_category_word_counts([(w, label) for w in words])
+                if self._ngram_size > 1:
+                    self._build_category_ngram_counts(words, label)
 
         # Calculate category priors
         for cat, category_doc_count in docs_per_category.items():
@@ -206,22 +392,112 @@ class Classifier:
             for category, word_count_map in self._word_freq_per_category.items()
         }
 
-        for category, word_count_map in self._word_freq_per_category.items():
-            category_total = self._total_words_per_category[category]
-            for word, freq in word_count_map.items():
-                if category not in self._likelihoods:
-                    self._likelihoods[category] = WordLikelihood(
-                        k=k, vocab_size=len(self._vocab), total_words=category_total
-                    )
+        self._build_likelihoods(k)
 
+        if self._ngram_sketches:
+            self._ngram_k = k
+            self._ngram_vocab_size = CountMinSketch.merge(
+                self._ngram_sketches.values()
+            ).distinct_estimate()
+
+    def _build_likelihoods(self, k: float | Mapping[str, float]):
+        """
+        Computes the smoothed word likelihoods of every category from the raw word counts.
+
+        Args:
+            k (float | Mapping[str, float]): the smoothing parameter, either shared by
+                every category or given per category.
+        """
+        self._likelihoods = {}
+
+        for category in self._priors:
+            category_k = k if isinstance(k, (int, float)) else k[category]
+            category_total = self._total_words_per_category.get(category, 0)
+
+            self._likelihoods[category] = WordLikelihood(
+                k=category_k, vocab_size=len(self._vocab), total_words=category_total
+            )
+
+            for word, freq in self._word_freq_per_category.get(category, {}).items():
                 self._likelihoods[category][word] = (
                     self._calculate_smoothed_word_likelihood(
                         freq,
                         category_total,
-                        k,
+                        category_k,
                     )
                 )
 
+    def set_smoothing(self, k: float | Mapping[str, float]):
+        """
+        Recompute the word likelihoods of a trained classifier with a new smoothing parameter.
+
+        The likelihoods are rebuilt from the raw word counts kept by the classifier,
+        so the training data is neither re-tokenized nor recounted. N-gram features
+        keep the smoothing parameter they were trained with.
+
+        Args:
+            k (float | Mapping[str, float]): the smoothing parameter for Laplace
+                smoothing, either shared by every category or given per category.
+        """
+        self._build_likelihoods(k)
+
+    def freeze(self, dtype: str = "float64") -> FrozenClassifier:
+        """
+        Produce a read-only scoring model from the trained classifier.
+
+        Args:
+            dtype (str): the storage type of the frozen log-likelihood table, one of
+                "float64", "float32", "int16" or "int8". Integer types are quantized
+                with a per-category scale and offset. Defaults to "float64".
+
+        Returns:
+            FrozenClassifier: the frozen scoring model
+
+        Raises:
+            ValueError: if the classifier counts word n-grams (`ngram_size` > 1),
+                which the frozen model doesn't score
+        """
+        return FrozenClassifier.from_classifier(self, dtype)
+
+    def memory_report(self) -> MemoryReport:
+        """
+        Break down the memory used by the classifier.
+
+        The report covers the bytes held by the vocabulary, word counts, likelihoods,
+        priors and n-gram sketches, the spaCy model if it is loaded, vocabulary and
+        per-category count statistics, and the projected size of compact
+        representations (frozen tables of every storage type, pruning rare words).
+
+        Returns:
+            MemoryReport: the memory report of the classifier
+        """
+        return memory_report(self)
+
+    def word_count_matrix(self) -> np.ndarray:
+        """
+        The raw word counts of the classifier as a dense array.
+
+        Rows follow the order of `categories`, and columns follow the
+        indices of the `vocabulary`.
+
+        Returns:
+            np.ndarray: a `(len(categories), len(vocabulary))` int64 array of word counts
+        """
+        counts = np.zeros((len(self._priors), len(self._vocab)), dtype=np.int64)
+
+        for i, category in enumerate(self._priors):
+            word_counts = self._word_freq_per_category.get(category, {})
+            columns = np.fromiter(
+                (self._vocab[w] for w in word_counts),
+                dtype=np.intp,
+                count=len(word_counts),
+            )
+            counts[i, columns] = np.fromiter(
+                word_counts.values(), dtype=np.int64, count=len(word_counts)
+            )
+
+        return counts
+
     def _calculate_smoothed_word_likelihood(
         self,
         word_freq: int,
@@ -254,21 +530,153 @@ class Classifier:
         Returns:
             dict mapping category -> probability
         """
-        words = parse_words(doc)
-        bag = WordBag(words)
+        return self.predict_words(parse_words(doc))
+
+    def predict_words(self, words: list[str]) -> dict[str, float]:
+        """
+        Predict category probabilities for a document that is already tokenized.
+
+        Args:
+            words: the ordered words of the document, as returned by `parse_words`
+
+        Returns:
+            dict mapping category -> probability
+        """
+        # initialize scores with the category priors
+        log_result = {category: log(prior) for category, prior in self._priors.items()}
 
-        log_result: Mapping[str, float] = {}
+        self._add_log_likelihoods(words, log_result)
 
-        for category, prior in self._priors.items():
-            # initialize score
-            score = log(prior)
+        return self._to_probabilities(log_result)
 
+    def predict_stream(
+        self,
+        doc: str,
+        chunk_size: int = 4096,
+        confidence_margin: float | None = None,
+        token_budget: int | None = None,
+        char_budget: int | None = None,
+    ) -> StreamingPrediction:
+        """
+        Predict category probabilities for a long document, one chunk at a time.
+
+        The document is tokenized in chunks of about `chunk_size` characters, and the
+        per-category log-scores are updated after every chunk. Scoring stops early
+        once the log-posterior margin between the top two categories reaches
+        `confidence_margin`, once `token_budget` words have been scored, or once
+        `char_budget` characters have been tokenized.
+
+        Only words left after filtering stop words, punctuation and numbers count
+        against `token_budget`, so text with few such words can be tokenized at
+        length without using it up. `char_budget` bounds the tokenization work
+        itself, so setting it bounds the cost of a prediction regardless of the
+        document's length and content.
+
+        N-gram features spanning two chunks are not counted.
+
+        Args:
+            doc: input text string
+            chunk_size: the approximate number of characters tokenized at a time
+            confidence_margin: stop once the top category's log-score exceeds the
+                runner-up's by this much, i.e. once it is exp(margin) times more
+                probable. Defaults to None, which never stops on confidence.
+            token_budget: the maximum number of words to score. Defaults to None,
+                which scores the whole document.
+            char_budget: the maximum number of characters to tokenize. The document
+                is cut at the last whitespace within the budget, or mid-word if
+                there is none. Defaults to None, which tokenizes the whole document.
+
+        Returns:
+            StreamingPrediction: the category probabilities, and how much of
+                the document was consumed to compute them
+        """
+        log_result = {category: log(prior) for category, prior in self._priors.items()}
+        tokens_consumed = 0
+        chars_consumed = 0
+        stop_reason = "exhausted"
+
+        text = doc
+
+        if char_budget is not None and len(doc) > char_budget:
+            # only tokenize the characters within the budget, without cutting
+            # the last word in half unless it's the only one
+            text = doc[:char_budget]
+            cut = max(text.rfind(" "), text.rfind("\n"))
+            if cut > 0:
+                text = doc[: cut + 1]
+
+        for chunk, chunk_end in iter_chunks(text, chunk_size):
+            if token_budget is not None and tokens_consumed >= token_budget:
+                # don't tokenize a chunk that can't be scored
+                stop_reason = "token_budget"
+                break
+
+            spans = parse_word_spans(chunk)
+            chars_consumed = chunk_end
+
+            if token_budget is not None and tokens_consumed + len(spans) > token_budget:
+                spans = spans[: token_budget - tokens_consumed]
+                stop_reason = "token_budget"
+
+                # only count the characters up to the last word scored
+                chunk_start = chunk_end - len(chunk)
+                chars_consumed = chunk_start + spans[-1][1]
+
+            words = [word for word, _ in spans]
+
+            self._add_log_likelihoods(words, log_result)
+            tokens_consumed += len(words)
+
+            if stop_reason == "token_budget":
+                break
+
+            if confidence_margin is not None and len(log_result) > 1:
+                top, runner_up = sorted(log_result.values(), reverse=True)[:2]
+
+                if top - runner_up >= confidence_margin and chunk_end < len(doc):
+                    stop_reason = "confidence"
+                    break
+
+        if stop_reason == "exhausted" and len(text) < len(doc):
+            stop_reason = "char_budget"
+
+        return StreamingPrediction(
+            probabilities=self._to_probabilities(log_result),
+            tokens_consumed=tokens_consumed,
+            chars_consumed=chars_consumed,
+            total_chars=len(doc),
+            stop_reason=stop_reason,
+        )
+
+    def _add_log_likelihoods(self, words: list[str], log_result: dict[str, float]):
+        """
+        Adds the smoothed log-likelihoods of a document's words to its category scores.
+
+        Args:
+            words (list[str]): the ordered words of the document
+            log_result (dict[str, float]): per-category log-scores, updated in place
+        """
+        bag = WordBag(words)
+
+        for category in log_result:
             # aggregate the scores contributed by each word
             for word, count in bag.items():
-                score += count * log(self._likelihoods[category][word])
+                log_result[category] += count * log(self._likelihoods[category][word])
 
-            log_result[category] = score
+        if self._ngram_size > 1:
+            self._add_ngram_log_likelihoods(words, log_result)
 
+    @staticmethod
+    def _to_probabilities(log_result: Mapping[str, float]) -> dict[str, float]:
+        """
+        Converts per-category log-scores into probabilities that sum to one.
+
+        Args:
+            log_result (Mapping[str, float]): unnormalized per-category log-scores
+
+        Returns:
+            dict[str, float]: a dictionary mapping category -> probability
+        """
         # convert the logarithmic values calculated into human-readable
         # probability values
         max_log = max(log_result.values())
@@ -276,3 +684,46 @@ class Classifier:
         total = sum(exp_result.values())
 
         return {c: score / total for c, score in exp_result.items()}
+
+    def _add_ngram_log_likelihoods(
+        self, words: list[str], log_result: dict[str, float]
+    ):
+        """
+        Adds the smoothed n-gram log-likelihoods of a document to its category scores.
+
+        The n-grams are hashed once, and their estimated counts are gathered from
+        each category's sketch in a single vectorized lookup.
+
+        Args:
+            words (list[str]): the ordered words of the document
+            log_result (dict[str, float]): per-category log-scores, updated in place
+        """
+        grams = WordBag(ngrams(words, self._ngram_size))
+
+        if not grams or not self._ngram_sketches:
+            return
+
+        counts = np.fromiter(grams.values(), dtype=np.float64, count=len(grams))
+        idx: np.ndarray | None = None
+        k = self._ngram_k
+
+        for category in log_result:
+            sketch = self._ngram_sketches.get(category)
+
+            if sketch is None:
+                # the category never saw an n-gram, so every n-gram is unseen
+                log_result[category] += counts.sum() * log(
+                    k / (k * self._ngram_vocab_size)
+                )
+                continue
+
+            if idx is None:
+                # every sketch shares its shape, so the indices are computed once
+                idx = sketch.indices(hash_features(grams.keys()))
+
+            estimates = sketch.estimate_at(idx)
+            denominator = sketch.total + k * self._ngram_vocab_size
+
+            log_result[category] += float(
+                counts @ np.log((estimates + k) / denominator)
+            )
@@ -0,0 +1,298 @@
+"""
+This module contains the pre-tokenized corpus representation used
+to train and evaluate classifiers without re-running the tokenizer.
+
+Every document is stored as a slice of one flat array of token ids,
+so per-category word counts can be built with a single `np.bincount`
+instead of per-word dictionary increments.
+
+A tokenized corpus can be cached on disk as a directory of `.npy` arrays
+(memory-mapped on load) and a vocabulary side file, keyed by a fingerprint
+of the dataset and of the tokenizer configuration.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from hashlib import blake2b
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from .logger import get_logger
+from .parser import parse_words, tokenizer_config
+from .storage import load_arrays, save_arrays
+
+logger = get_logger(__name__)
+
+# names of the files of a cached corpus
+_ARRAYS = ("tokens", "offsets", "labels")
+
+
+class TokenizedCorpus:
+    """
+    A labeled corpus, tokenized once into flat arrays of token ids.
+
+    The tokens of document `i` are `tokens[offsets[i]:offsets[i + 1]]`,
+    and its category is `categories[labels[i]]`.
+
+    Attributes:
+        tokens (np.ndarray): int32 token ids of every document, back to back.
+
+        offsets (np.ndarray): int64 start offset of every document, plus the
+            total token count as the final entry.
+
+        labels (np.ndarray): int32 category id of every document.
+
+        words (list[str]): the vocabulary, where `words[i]` is the word of token id `i`.
+
+        categories (tuple[str, ...]): category labels, in order of first appearance.
+    """
+
+    def __init__(
+        self,
+        tokens: np.ndarray,
+        offsets: np.ndarray,
+        labels: np.ndarray,
+        words: list[str],
+        categories: tuple[str, ...],
+    ):
+        self.tokens = tokens
+        self.offsets = offsets
+        self.labels = labels
+        self.words = words
+        self.categories = categories
+
+    @classmethod
+    def from_dataset(cls, dataset: Iterable[tuple[str, str]]) -> "TokenizedCorpus":
+        """
+        Tokenize a labeled dataset.
+
+        Args:
+            dataset: tuples where the first element is a document and the
+                second element is the category the document belongs to
+
+        Returns:
+            The tokenized corpus
+        """
+        return cls.from_tokenized((parse_words(doc), label) for doc, label in dataset)
+
+    @classmethod
+    def from_tokenized(
+        cls, documents: Iterable[tuple[Sequence[str], str]]
+    ) -> "TokenizedCorpus":
+        """
+        Build a corpus from documents that are already split into words.
+
+        Args:
+            documents: tuples where the first element is the words of a document
+                and the second element is the category the document belongs to
+
+        Returns:
+            The tokenized corpus
+        """
+        word_ids: dict[str, int] = {}
+        category_ids: dict[str, int] = {}
+        tokens: list[int] = []
+        offsets = [0]
+        labels: list[int] = []
+
+        for words, label in documents:
+            # clean the label in case the dataset is inconsistent
+            label = label.lower()
+
+            labels.append(category_ids.setdefault(label, len(category_ids)))
+            tokens.extend(word_ids.setdefault(w, len(word_ids)) for w in words)
+            offsets.append(len(tokens))
+
+        return cls(
+            tokens=np.array(tokens, dtype=np.int32),
+            offsets=np.array(offsets, dtype=np.int64),
+            labels=np.array(labels, dtype=np.int32),
+            words=list(word_ids),
+            categories=tuple(category_ids),
+        )
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def document(self, index: int) -> np.ndarray:
+        """
+        Obtains the token ids of a document.
+
+        Args:
+            index: the position of the document in the corpus
+
+        Returns:
+            the token ids of the document, in order
+        """
+        return self.tokens[self.offsets[index] : self.offsets[index + 1]]
+
+    def document_lengths(self) -> np.ndarray:
+        """
+        Obtains the number of tokens of every document.
+
+        Returns:
+            an int64 array of document lengths, in corpus order
+        """
+        return np.diff(self.offsets)
+
+    def subset_tokens(self, doc_indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the tokens of a subset of documents.
+
+        Args:
+            doc_indices: positions of the documents to gather
+
+        Returns:
+            A tuple `(tokens, token_documents)`, where `token_documents[j]` is the
+            position in `doc_indices` of the document that token `j` belongs to
+        """
+        starts = self.offsets[doc_indices]
+        lengths = self.offsets[doc_indices + 1] - starts
+
+        # expand the [start, end) ranges of every document into token positions
+        positions = np.arange(lengths.sum()) + np.repeat(
+            starts - (np.cumsum(lengths) - lengths), lengths
+        )
+
+        return self.tokens[positions], np.repeat(np.arange(len(doc_indices)), lengths)
+
+    def word_counts(self, doc_indices: np.ndarray | None = None) -> np.ndarray:
+        """
+        Count the occurrences of every word in every category.
+
+        Args:
+            doc_indices: positions of the documents to count, defaults to all of them
+
+        Returns:
+            A `(len(categories), len(words))` int64 array of word counts
+        """
+        n_categories, n_words = len(self.categories), len(self.words)
+
+        if doc_indices is None:
+            tokens = self.tokens
+            token_labels = np.repeat(self.labels, self.document_lengths())
+        else:
+            tokens, token_documents = self.subset_tokens(doc_indices)
+            token_labels = self.labels[doc_indices][token_documents]
+
+        # flatten (category, word) pairs into a single index for bincount
+        flat = token_labels.astype(np.int64) * n_words + tokens
+
+        return np.bincount(flat, minlength=n_categories * n_words).reshape(
+            n_categories, n_words
+        )
+
+    def document_counts(self, doc_indices: np.ndarray | None = None) -> np.ndarray:
+        """
+        Count the documents of every category.
+
+        Args:
+            doc_indices: positions of the documents to count, defaults to all of them
+
+        Returns:
+            A `len(categories)` int64 array of document counts
+        """
+        labels = self.labels if doc_indices is None else self.labels[doc_indices]
+
+        return np.bincount(labels, minlength=len(self.categories)).astype(np.int64)
+
+    def save(self, directory: str | Path):
+        """
+        Write the corpus to a directory.
+
+        The token, offset and label arrays are stored as `.npy` files, and
+        the words and categories in a JSON vocabulary side file.
+
+        Args:
+            directory: the directory to write to, created if missing
+        """
+        save_arrays(
+            directory,
+            {name: getattr(self, name) for name in _ARRAYS},
+            {"words": self.words, "categories": self.categories},
+        )
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "TokenizedCorpus":
+        """
+        Read a corpus written by `save`.
+
+        Args:
+            directory: the directory to read from
+            mmap: memory-map the arrays read-only instead of reading them into memory
+
+        Returns:
+            The tokenized corpus
+        """
+        arrays, vocabulary = load_arrays(directory, _ARRAYS, mmap)
+
+        return cls(
+            words=vocabulary["words"],
+            categories=tuple(vocabulary["categories"]),
+            **arrays,
+        )
+
+
+def fingerprint(dataset: Iterable[tuple[str, str]]) -> str:
+    """
+    Compute a key identifying a dataset tokenized with the current tokenizer.
+
+    Args:
+        dataset: tuples where the first element is a document and the
+            second element is the category the document belongs to
+
+    Returns:
+        a hex digest of the documents, their labels and the tokenizer configuration
+    """
+    digest = blake2b(digest_size=16)
+    digest.update(json.dumps(tokenizer_config(), sort_keys=True).encode("utf-8"))
+
+    for doc, label in dataset:
+        # length-prefix every field so that no two datasets hash the same
+        for field in (doc, label):
+            data = field.encode("utf-8")
+            digest.update(len(data).to_bytes(8))
+            digest.update(data)
+
+    return digest.hexdigest()
+
+
+def load_or_build(
+    dataset: Sequence[tuple[str, str]], cache_dir: str | Path
+) -> TokenizedCorpus:
+    """
+    Load a dataset's tokenized corpus from the cache, tokenizing and caching it on a miss.
+
+    Args:
+        dataset: tuples where the first element is a document and the
+            second element is the category the document belongs to
+        cache_dir: the directory holding cached corpora, one sub-directory per fingerprint
+
+    Returns:
+        The tokenized corpus, memory-mapped from the cache
+    """
+    key = fingerprint(dataset)
+    directory = Path(cache_dir) / key
+
+    if not directory.exists():
+        logger.debug(f"Corpus cache miss for {key}, tokenizing {len(dataset)} docs")
+
+        # write to a temporary directory first, so that concurrent builders
+        # and interrupted builds never leave a partial cache entry behind
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=cache_dir, prefix=f".{key}-")
+
+        try:
+            TokenizedCorpus.from_dataset(dataset).save(staging)
+            os.rename(staging, directory)
+        except OSError:
+            if not directory.exists():
+                raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    return TokenizedCorpus.load(directory)
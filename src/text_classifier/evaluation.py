@@ -0,0 +1,197 @@
+"""
+This module contains the evaluation harness for Naive Bayes classifiers.
+
+Naive Bayes counts are additive: the word and document counts of a
+model trained on every document except a fold are the counts of the full
+corpus minus the counts of that fold. Cross-validation therefore tokenizes
+the corpus once, builds the full count tables once, and derives every fold's
+model by subtraction, instead of retraining a `Classifier` per fold.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from .corpus import TokenizedCorpus
+
+
+@dataclass(frozen=True)
+class EvaluationReport:
+    """
+    Classification quality of a model over a labeled set of documents.
+
+    Attributes:
+        categories (tuple[str, ...]): category labels, indexing both axes of
+            the confusion matrix.
+
+        confusion (np.ndarray): `confusion[i, j]` is the number of documents of
+            category `i` that were predicted as category `j`.
+
+        fold_accuracies (tuple[float, ...]): the accuracy of every fold, when
+            the report pools several cross-validation folds.
+    """
+
+    categories: tuple[str, ...]
+    confusion: np.ndarray
+    fold_accuracies: tuple[float, ...] = ()
+
+    @property
+    def accuracy(self) -> float:
+        """
+        The fraction of documents predicted as their true category.
+        """
+        total = self.confusion.sum()
+        return float(np.trace(self.confusion) / total) if total else 0.0
+
+    @property
+    def precision(self) -> dict[str, float]:
+        """
+        Per-category precision: the fraction of documents predicted as a
+        category that truly belong to it.
+        """
+        predicted = self.confusion.sum(axis=0)
+        return {
+            c: float(self.confusion[i, i] / predicted[i]) if predicted[i] else 0.0
+            for i, c in enumerate(self.categories)
+        }
+
+    @property
+    def recall(self) -> dict[str, float]:
+        """
+        Per-category recall: the fraction of documents of a category that
+        were predicted as that category.
+        """
+        actual = self.confusion.sum(axis=1)
+        return {
+            c: float(self.confusion[i, i] / actual[i]) if actual[i] else 0.0
+            for i, c in enumerate(self.categories)
+        }
+
+
+def kfold_splits(n_docs: int, folds: int, seed: int = 0) -> list[np.ndarray]:
+    """
+    Randomly partition document positions into folds.
+
+    Args:
+        n_docs: the number of documents to partition
+        folds: the number of folds
+        seed: seed of the random shuffle
+
+    Returns:
+        A list of `folds` sorted arrays of held-out document positions
+    """
+    if not 2 <= folds <= n_docs:
+        raise ValueError("folds must be between 2 and the number of documents")
+
+    order = np.random.default_rng(seed).permutation(n_docs)
+
+    return [np.sort(fold) for fold in np.array_split(order, folds)]
+
+
+def score_held_out(
+    corpus: TokenizedCorpus,
+    word_counts: np.ndarray,
+    document_counts: np.ndarray,
+    held_out: np.ndarray,
+    k: float = 1.0,
+) -> np.ndarray:
+    """
+    Score held-out documents with the model trained on every other document.
+
+    The training counts are derived by subtracting the held-out documents'
+    counts from the full corpus counts, which gives exactly the model that
+    `Classifier.train` would build from the remaining documents.
+
+    Args:
+        corpus: the tokenized corpus
+        word_counts: the full `(categories, words)` count table, as returned
+            by `corpus.word_counts()`
+        document_counts: the full per-category document counts, as returned
+            by `corpus.document_counts()`
+        held_out: positions of the documents to hold out and score
+        k: the smoothing parameter for Laplace smoothing. Defaults to 1.0.
+
+    Returns:
+        A `(len(held_out), categories)` array of unnormalized log-posteriors.
+        Categories absent from the training documents score negative infinity.
+    """
+    train_counts = word_counts - corpus.word_counts(held_out)
+    train_docs = document_counts - corpus.document_counts(held_out)
+
+    # the vocabulary only holds words seen in the training documents
+    vocab_size = np.count_nonzero(train_counts.sum(axis=0))
+    category_totals = train_counts.sum(axis=1)
+
+    with np.errstate(divide="ignore"):
+        log_priors = np.log(train_docs / train_docs.sum())
+
+    log_likelihoods = (
+        np.log(train_counts + k) - np.log(category_totals + k * vocab_size)[:, None]
+    )
+
+    tokens, token_documents = corpus.subset_tokens(held_out)
+    scores = np.empty((len(held_out), len(corpus.categories)))
+
+    for c in range(len(corpus.categories)):
+        scores[:, c] = log_priors[c] + np.bincount(
+            token_documents,
+            weights=log_likelihoods[c, tokens],
+            minlength=len(held_out),
+        )
+
+    return scores
+
+
+def cross_validate(
+    dataset: Iterable[tuple[str, str]] | TokenizedCorpus,
+    folds: int = 5,
+    k: float = 1.0,
+    seed: int = 0,
+    max_workers: int | None = None,
+) -> EvaluationReport:
+    """
+    Evaluate a Naive Bayes classifier with k-fold cross-validation.
+
+    Args:
+        dataset: the labeled documents, either as (document, category) tuples
+            or as an already tokenized corpus
+        folds: the number of folds
+        k: the smoothing parameter for Laplace smoothing. Defaults to 1.0.
+        seed: seed of the random fold assignment
+        max_workers: the number of folds scored in parallel, defaults to the
+            `ThreadPoolExecutor` default
+
+    Returns:
+        An EvaluationReport pooling the predictions of every fold
+    """
+    corpus = (
+        dataset
+        if isinstance(dataset, TokenizedCorpus)
+        else TokenizedCorpus.from_dataset(dataset)
+    )
+
+    # full count tables, built once and shared by every fold
+    word_counts = corpus.word_counts()
+    document_counts = corpus.document_counts()
+    n_categories = len(corpus.categories)
+
+    def evaluate_fold(held_out: np.ndarray) -> np.ndarray:
+        scores = score_held_out(corpus, word_counts, document_counts, held_out, k)
+        confusion = np.zeros((n_categories, n_categories), dtype=np.int64)
+        np.add.at(confusion, (corpus.labels[held_out], scores.argmax(axis=1)), 1)
+        return confusion
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        confusions = list(
+            pool.map(evaluate_fold, kfold_splits(len(corpus), folds, seed))
+        )
+
+    return EvaluationReport(
+        categories=corpus.categories,
+        confusion=sum(confusions, np.zeros((n_categories, n_categories), np.int64)),
+        fold_accuracies=tuple(
+            float(np.trace(c) / c.sum()) if c.sum() else 0.0 for c in confusions
+        ),
+    )
@@ -1,4 +1,4 @@
-from typing import Iterable
+from typing import Iterable, Sequence
 
 import numpy as np
 
@@ -9,10 +9,12 @@ class Vocabulary(dict[str, int]):
     a permanent index value associated with it.
     """
 
-    _count: int = 0
+    def __init__(self):
+        super().__init__()
+        self._count = 0
 
-    # store reverse mapping for fast word lookups
-    _reverse_mapping: dict[int, str] = {}
+        # store reverse mapping for fast word lookups, per vocabulary
+        self._reverse_mapping: dict[int, str] = {}
 
     def register(self, words: Iterable[str]):
         """
@@ -143,3 +145,32 @@ def vectorize(bag: WordBag, vocab: Vocabulary) -> np.ndarray:
         vector[index] = freq
 
     return vector
+
+
+def ngrams(words: Sequence[str], max_n: int, min_n: int = 2) -> list[str]:
+    """
+    Build the word n-grams of a sequence of words.
+
+    Each n-gram is represented as its words joined by a single space,
+    for every order from `min_n` to `max_n` inclusive.
+
+    Args:
+        words: the ordered words of a document
+        max_n: the highest n-gram order to build
+        min_n: the lowest n-gram order to build, defaults to bigrams
+
+    Returns:
+        A list of n-gram strings, grouped by increasing order
+
+    Example:
+        ```
+        words = ["free", "entry", "wkly", "comp"]
+
+        print(ngrams(words, 2)) # ["free entry", "entry wkly", "wkly comp"]
+        ```
+    """
+    return [
+        " ".join(words[i : i + n])
+        for n in range(min_n, max_n + 1)
+        for i in range(len(words) - n + 1)
+    ]
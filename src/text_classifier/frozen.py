@@ -0,0 +1,514 @@
+"""
+This module contains the frozen scoring model of a trained classifier.
+
+A frozen model stores the per-category log-likelihoods of the vocabulary as
+one dense `(categories, words)` table instead of dictionaries of boxed
+floats. The table can be stored in reduced precision (float32) or quantized
+to int16/int8 with a per-category scale and offset, which shrinks the model
+(and its memory-mapped files) by 2-8x and keeps more of it in cache.
+Scores are always accumulated in float64.
+
+A frozen model is immutable: its arrays are read-only and its vocabulary is
+a read-only mapping, so a single instance can be shared by any number of
+threads without locking, including on free-threaded (no-GIL) builds.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from .features import WordBag
+from .parser import parse_words
+from .storage import load_arrays, save_arrays
+
+if TYPE_CHECKING:
+    from .classifier import Classifier
+
+# storage types supported for the log-likelihood table
+TABLE_DTYPES = ("float64", "float32", "int16", "int8")
+
+# names of the files of a saved model
+_ARRAYS = ("table", "log_priors", "log_unseen", "scale", "offset")
+
+
+def gil_enabled() -> bool:
+    """
+    Whether the running interpreter has a global interpreter lock.
+
+    Returns:
+        False on free-threaded CPython builds running without the GIL,
+        True otherwise
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """
+    Obtain a read-only view of an array, leaving the array itself untouched.
+    """
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def quantize(
+    log_likelihoods: np.ndarray, dtype: str
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Quantize a `(categories, words)` table, row by row, into an integer type.
+
+    Every row is mapped linearly onto the full range of the integer type,
+    so that `table[c] * scale[c] + offset[c]` approximates the original row
+    with an error of at most `scale[c] / 2`.
+
+    Args:
+        log_likelihoods: the float64 table to quantize
+        dtype: the integer storage type, "int16" or "int8"
+
+    Returns:
+        A tuple `(table, scale, offset)` of the quantized table and the
+        float64 per-category scale and offset
+    """
+    info = np.iinfo(dtype)
+    n_categories, n_words = log_likelihoods.shape
+
+    if n_words == 0:
+        return (
+            np.zeros((n_categories, 0), dtype=dtype),
+            np.ones(n_categories),
+            np.zeros(n_categories),
+        )
+
+    low = log_likelihoods.min(axis=1)
+    high = log_likelihoods.max(axis=1)
+
+    scale = (high - low) / (int(info.max) - int(info.min))
+    # constant rows have no range to map, any positive scale is exact for them
+    scale[scale == 0] = 1.0
+    offset = low - info.min * scale
+
+    table = np.rint((log_likelihoods - offset[:, None]) / scale[:, None])
+
+    return np.clip(table, info.min, info.max).astype(dtype), scale, offset
+
+
+class FrozenClassifier:
+    """
+    An immutable scoring model produced from a trained `Classifier`.
+
+    Every attribute is set once at construction: the arrays are read-only
+    views, the vocabulary is a read-only mapping, and assigning or deleting
+    attributes raises an AttributeError. Scoring only reads shared state and
+    allocates its own temporaries, so a FrozenClassifier is safe to share
+    across threads, and `predict_many` scores batches of documents in a
+    thread pool.
+
+    Only unigram features are frozen, so classifiers that count word n-grams
+    can't be frozen.
+
+    Attributes:
+        categories (tuple[str, ...]): category labels, indexing the table rows.
+
+        words (Mapping[str, int]): the vocabulary, mapping words to table columns.
+
+        table (np.ndarray): `(categories, words)` log-likelihoods, stored as `dtype`.
+
+        log_priors (np.ndarray): float64 log-prior of every category.
+
+        log_unseen (np.ndarray): float64 log-likelihood of out-of-vocabulary
+            words for every category.
+
+        scale (np.ndarray): float64 per-category scale of a quantized table,
+            all ones otherwise.
+
+        offset (np.ndarray): float64 per-category offset of a quantized table,
+            all zeros otherwise.
+    """
+
+    __slots__ = _ARRAYS + ("categories", "words")
+
+    def __init__(
+        self,
+        categories: tuple[str, ...],
+        words: Mapping[str, int],
+        table: np.ndarray,
+        log_priors: np.ndarray,
+        log_unseen: np.ndarray,
+        scale: np.ndarray,
+        offset: np.ndarray,
+    ):
+        # bypass the immutability guard, this is the only place attributes are set
+        init = object.__setattr__
+
+        init(self, "categories", tuple(categories))
+        init(self, "words", MappingProxyType(dict(words)))
+        init(self, "table", _read_only(table))
+        init(self, "log_priors", _read_only(log_priors))
+        init(self, "log_unseen", _read_only(log_unseen))
+        init(self, "scale", _read_only(scale))
+        init(self, "offset", _read_only(offset))
+
+    def __setattr__(self, name: str, value: object):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @classmethod
+    def from_classifier(
+        cls, classifier: "Classifier", dtype: str = "float64"
+    ) -> "FrozenClassifier":
+        """
+        Freeze the likelihood tables of a trained classifier.
+
+        Args:
+            classifier: the trained classifier to freeze
+            dtype: the storage type of the log-likelihood table, one of `TABLE_DTYPES`
+
+        Returns:
+            A FrozenClassifier scoring documents like `classifier`, up to the
+            precision of `dtype`
+
+        Raises:
+            ValueError: if `dtype` isn't supported, or if `classifier` counts
+                word n-grams, which a frozen model can't score
+        """
+        if dtype not in TABLE_DTYPES:
+            raise ValueError(f"dtype must be one of {TABLE_DTYPES}, got {dtype!r}")
+
+        if classifier.ngram_sketches_per_category:
+            raise ValueError("classifiers with word n-gram features can't be frozen")
+
+        categories = classifier.categories
+        likelihoods = classifier.word_likelihoods_per_category
+        vocab = classifier.vocabulary
+
+        log_unseen = np.log(
+            [likelihoods[c].unseen_likelihood for c in categories], dtype=np.float64
+        )
+
+        # every in-vocabulary word starts at the unseen likelihood of the
+        # category, and the words the category saw are filled in
+        log_likelihoods = np.repeat(log_unseen[:, None], len(vocab), axis=1)
+
+        for i, category in enumerate(categories):
+            seen = likelihoods[category]
+            columns = np.fromiter(
+                (vocab[w] for w in seen), dtype=np.intp, count=len(seen)
+            )
+            log_likelihoods[i, columns] = np.log(
+                np.fromiter(seen.values(), dtype=np.float64, count=len(seen))
+            )
+
+        scale = np.ones(len(categories))
+        offset = np.zeros(len(categories))
+
+        if dtype.startswith("int"):
+            table, scale, offset = quantize(log_likelihoods, dtype)
+        else:
+            table = log_likelihoods.astype(dtype)
+
+        return cls(
+            categories=categories,
+            words=dict(vocab),
+            table=table,
+            log_priors=np.log([classifier.priors[c] for c in categories]),
+            log_unseen=log_unseen,
+            scale=scale,
+            offset=offset,
+        )
+
+    @property
+    def dtype(self) -> str:
+        """
+        The storage type of the log-likelihood table.
+        """
+        return self.table.dtype.name
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The memory taken by the model's arrays, in bytes.
+        """
+        return sum(getattr(self, name).nbytes for name in _ARRAYS)
+
+    def log_scores(self, bag: WordBag) -> np.ndarray:
+        """
+        Compute the unnormalized log-posterior of every category for a document.
+
+        Args:
+            bag: the document's bag of words
+
+        Returns:
+            A float64 array of log-scores, aligned with `categories`
+        """
+        known = [(self.words[w], n) for w, n in bag.items() if w in self.words]
+        unseen_count = sum(bag.values()) - sum(n for _, n in known)
+
+        scores = self.log_priors + unseen_count * self.log_unseen
+
+        if not known:
+            return scores
+
+        columns, counts = np.array(known, dtype=np.int64).T
+        rows = self.table[:, columns]
+
+        if self.table.dtype.kind == "i":
+            # accumulate the integer codes exactly, then dequantize once per category
+            quantized = rows.astype(np.int64) @ counts
+            scores += quantized * self.scale + counts.sum() * self.offset
+        else:
+            scores += rows.astype(np.float64) @ counts
+
+        return scores
+
+    def predict_bag(self, bag: WordBag) -> dict[str, float]:
+        """
+        Predict category probabilities for a tokenized document.
+
+        Args:
+            bag: the document's bag of words
+
+        Returns:
+            dict mapping category -> probability
+        """
+        scores = self.log_scores(bag)
+        exp_scores = np.exp(scores - scores.max())
+        probabilities = exp_scores / exp_scores.sum()
+
+        return {c: float(p) for c, p in zip(self.categories, probabilities)}
+
+    def log_scores_many(self, documents: Sequence[Sequence[str]]) -> np.ndarray:
+        """
+        Compute the unnormalized log-posteriors of a batch of tokenized documents.
+
+        The vocabulary lookups are done word by word, but the table gather and
+        the per-document sums run as a few vectorized operations over the
+        whole batch.
+
+        Args:
+            documents: the words of every document
+
+        Returns:
+            A `(len(documents), categories)` float64 array of log-scores
+        """
+        columns: list[int] = []
+        lengths = np.zeros(len(documents), dtype=np.int64)
+        unseen_counts = np.zeros(len(documents), dtype=np.int64)
+
+        for d, words in enumerate(documents):
+            for word in words:
+                column = self.words.get(word)
+
+                if column is None:
+                    unseen_counts[d] += 1
+                else:
+                    columns.append(column)
+                    lengths[d] += 1
+
+        scores = self.log_priors + unseen_counts[:, None] * self.log_unseen
+
+        nonempty = np.flatnonzero(lengths)
+
+        if len(nonempty) == 0:
+            return scores
+
+        # each document's columns are contiguous, so every document with at
+        # least one known word is one segment of the gathered rows
+        rows = self.table[:, np.array(columns, dtype=np.intp)]
+        starts = (np.cumsum(lengths) - lengths)[nonempty]
+
+        if self.table.dtype.kind == "i":
+            # accumulate the integer codes exactly, then dequantize once per category
+            sums = np.add.reduceat(rows.astype(np.int64), starts, axis=1).T
+            scores[nonempty] += (
+                sums * self.scale + lengths[nonempty, None] * self.offset
+            )
+        else:
+            sums = np.add.reduceat(rows.astype(np.float64), starts, axis=1).T
+            scores[nonempty] += sums
+
+        return scores
+
+    def _predict_batch(
+        self, documents: Sequence[Sequence[str]]
+    ) -> list[dict[str, float]]:
+        """
+        Predict category probabilities for a batch of tokenized documents.
+
+        Args:
+            documents: the words of every document
+
+        Returns:
+            a list of dicts mapping category -> probability, one per document
+        """
+        scores = self.log_scores_many(documents)
+        exp_scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        probabilities = exp_scores / exp_scores.sum(axis=1, keepdims=True)
+
+        return [dict(zip(self.categories, row)) for row in probabilities.tolist()]
+
+    def predict_many(
+        self,
+        documents: Iterable[str | Sequence[str]],
+        max_workers: int | None = None,
+        batch_size: int = 256,
+    ) -> list[dict[str, float]]:
+        """
+        Predict category probabilities for many documents, scoring batches in parallel.
+
+        Batches of documents are scored by a pool of threads sharing this model.
+        On free-threaded CPython the batches run truly in parallel, so throughput
+        scales with the number of cores. With the GIL, only the vectorized parts
+        of scoring overlap, and the results are the same, just with less speedup.
+
+        Text documents are tokenized with `parse_words` on the calling thread
+        before scoring starts, since the spaCy pipeline isn't safe to share
+        across threads. Pass pre-tokenized word lists to parallelize the whole call.
+
+        Args:
+            documents: the documents to score, as text or as lists of words
+            max_workers: the number of scoring threads, defaults to the number of CPUs
+            batch_size: the number of documents scored by a thread at a time
+
+        Returns:
+            a list of dicts mapping category -> probability, in document order
+        """
+        tokenized = [parse_words(d) if isinstance(d, str) else d for d in documents]
+        batches = [
+            tokenized[i : i + batch_size] for i in range(0, len(tokenized), batch_size)
+        ]
+
+        workers = min(max_workers or os.cpu_count() or 1, len(batches))
+
+        if workers <= 1:
+            results = map(self._predict_batch, batches)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._predict_batch, batches))
+
+        return [prediction for batch in results for prediction in batch]
+
+    def predict(self, doc: str) -> dict[str, float]:
+        """
+        Predict category probabilities for the input document.
+
+        Args:
+            doc: input text string
+
+        Returns:
+            dict mapping category -> probability
+        """
+        return self.predict_bag(WordBag(parse_words(doc)))
+
+    def save(self, directory: str | Path):
+        """
+        Write the model to a directory of `.npy` arrays and a JSON vocabulary side file.
+
+        Args:
+            directory: the directory to write to, created if missing
+        """
+        # words are stored in column order, so the mapping can be rebuilt
+        words = sorted(self.words, key=self.words.__getitem__)
+
+        save_arrays(
+            directory,
+            {name: getattr(self, name) for name in _ARRAYS},
+            {"words": words, "categories": self.categories},
+        )
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "FrozenClassifier":
+        """
+        Read a model written by `save`.
+
+        Args:
+            directory: the directory to read from
+            mmap: memory-map the arrays read-only instead of reading them into memory
+
+        Returns:
+            The frozen model
+        """
+        arrays, vocabulary = load_arrays(directory, _ARRAYS, mmap)
+
+        return cls(
+            categories=tuple(vocabulary["categories"]),
+            words={w: i for i, w in enumerate(vocabulary["words"])},
+            **arrays,
+        )
+
+
+@dataclass(frozen=True)
+class PrecisionReport:
+    """
+    How much a reduced-precision model's predictions differ from a reference model's.
+
+    Attributes:
+        documents (int): the number of documents compared.
+
+        argmax_changes (int): the number of documents whose most probable
+            category differs from the reference.
+
+        max_probability_error (float): the largest absolute difference of any
+            category probability.
+
+        mean_probability_error (float): the mean absolute difference of the
+            category probabilities.
+    """
+
+    documents: int
+    argmax_changes: int
+    max_probability_error: float
+    mean_probability_error: float
+
+    @property
+    def argmax_change_rate(self) -> float:
+        """
+        The fraction of documents whose most probable category changed.
+        """
+        return self.argmax_changes / self.documents if self.documents else 0.0
+
+
+def compare_precision(
+    reference: FrozenClassifier,
+    candidate: FrozenClassifier,
+    documents: Iterable[str | WordBag],
+) -> PrecisionReport:
+    """
+    Measure how often a reduced-precision model disagrees with a reference model.
+
+    Args:
+        reference: the reference model, usually frozen as float64
+        candidate: the model to compare, frozen from the same classifier
+        documents: the documents to score, as text or already tokenized bags
+
+    Returns:
+        A PrecisionReport of the differences between both models' predictions
+    """
+    argmax_changes = 0
+    errors: list[np.ndarray] = []
+
+    for doc in documents:
+        bag = doc if isinstance(doc, WordBag) else WordBag(parse_words(doc))
+
+        expected = np.array(list(reference.predict_bag(bag).values()))
+        actual = np.array(list(candidate.predict_bag(bag).values()))
+
+        argmax_changes += int(expected.argmax() != actual.argmax())
+        errors.append(np.abs(expected - actual))
+
+    all_errors = np.concatenate(errors) if errors else np.zeros(1)
+
+    return PrecisionReport(
+        documents=len(errors),
+        argmax_changes=argmax_changes,
+        max_probability_error=float(all_errors.max()),
+        mean_probability_error=float(all_errors.mean()),
+    )
@@ -0,0 +1,220 @@
+"""
+This module contains an inverted-index scoring engine for trained
+classifiers with a large number of categories.
+
+Naive Bayes assigns every word that a category never saw the same
+"unseen" likelihood, so a document's score for a category can be split into
+
+    log P(c) + n_tokens * log P(unseen|c)                 (baseline)
+    + sum over words w seen in c of n_w * log(P(w|c) / P(unseen|c))
+
+Only the (word, category) pairs with a nonzero training count contribute to
+the second term. These are stored as a word -> categories posting list, so
+scoring a document touches the postings of its own words instead of
+computing a log-likelihood for every (category, word) pair.
+"""
+
+from math import log
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .features import WordBag
+from .parser import parse_words
+
+if TYPE_CHECKING:
+    from .classifier import Classifier
+
+
+class InvertedIndex:
+    """
+    An immutable scorer built from a trained `Classifier`, returning the
+    exact top-k categories of a document.
+
+    The per-category baselines are evaluated as a single vectorized
+    expression, and the sparse corrections are gathered from the postings
+    of the document's words only. The Python-level work therefore scales
+    with the postings touched rather than with the number of categories.
+
+    Only unigram features are indexed, so classifiers that count word
+    n-grams can't be indexed.
+
+    Attributes:
+        categories (tuple[str, ...]): category labels, in index order.
+
+        postings_count (int): the total number of (word, category) postings.
+    """
+
+    def __init__(
+        self,
+        categories: tuple[str, ...],
+        log_priors: np.ndarray,
+        log_unseen: np.ndarray,
+        words: dict[str, int],
+        indptr: np.ndarray,
+        posting_categories: np.ndarray,
+        posting_weights: np.ndarray,
+    ):
+        self.categories = categories
+
+        # per-category baseline terms
+        self._log_priors = log_priors
+        self._log_unseen = log_unseen
+
+        # compressed posting lists: the postings of word `i` are stored at
+        # positions indptr[i]:indptr[i + 1] of the posting arrays
+        self._words = words
+        self._indptr = indptr
+        self._posting_categories = posting_categories
+        self._posting_weights = posting_weights
+
+    @classmethod
+    def from_classifier(cls, classifier: "Classifier") -> "InvertedIndex":
+        """
+        Build the inverted index of a trained classifier.
+
+        Args:
+            classifier: the trained classifier to index
+
+        Returns:
+            An InvertedIndex that scores documents exactly like `classifier`
+
+        Raises:
+            ValueError: if `classifier` counts word n-grams, which the index
+                can't score
+        """
+        if classifier.ngram_sketches_per_category:
+            raise ValueError("classifiers with word n-gram features can't be indexed")
+
+        categories = classifier.categories
+        category_ids = {c: i for i, c in enumerate(categories)}
+        likelihoods = classifier.word_likelihoods_per_category
+
+        log_priors = np.array([log(classifier.priors[c]) for c in categories])
+        log_unseen = np.array(
+            [log(likelihoods[c].unseen_likelihood) for c in categories]
+        )
+
+        # gather the postings of every word, keyed by word
+        postings: dict[str, list[tuple[int, float]]] = {}
+
+        for category, word_counts in classifier.word_frequencies_per_category.items():
+            i = category_ids[category]
+
+            for word in word_counts:
+                postings.setdefault(word, []).append(
+                    (i, log(likelihoods[category][word]) - log_unseen[i])
+                )
+
+        words: dict[str, int] = {}
+        indptr = [0]
+        posting_categories: list[int] = []
+        posting_weights: list[float] = []
+
+        for word, word_postings in postings.items():
+            words[word] = len(words)
+
+            for category_id, weight in word_postings:
+                posting_categories.append(category_id)
+                posting_weights.append(weight)
+
+            indptr.append(len(posting_categories))
+
+        return cls(
+            categories=categories,
+            log_priors=log_priors,
+            log_unseen=log_unseen,
+            words=words,
+            indptr=np.array(indptr, dtype=np.int64),
+            posting_categories=np.array(posting_categories, dtype=np.int32),
+            posting_weights=np.array(posting_weights, dtype=np.float64),
+        )
+
+    @property
+    def postings_count(self) -> int:
+        """
+        The total number of (word, category) postings in the index.
+
+        Returns:
+            int: the number of postings, i.e. nonzero word-category counts
+        """
+        return len(self._posting_categories)
+
+    def log_scores(self, bag: WordBag) -> np.ndarray:
+        """
+        Compute the unnormalized log-posterior of every category for a document.
+
+        Args:
+            bag: the document's bag of words
+
+        Returns:
+            An array of log-scores, aligned with `categories`
+        """
+        n_tokens = sum(bag.values())
+        scores = self._log_priors + n_tokens * self._log_unseen
+
+        known = [(self._words[w], n) for w, n in bag.items() if w in self._words]
+
+        if not known:
+            return scores
+
+        word_ids, word_counts = np.array(known, dtype=np.int64).T
+        starts = self._indptr[word_ids]
+        lengths = self._indptr[word_ids + 1] - starts
+
+        # expand the [start, end) posting ranges of every word into one
+        # flat array of posting positions
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        positions = np.arange(lengths.sum()) + offsets
+
+        np.add.at(
+            scores,
+            self._posting_categories[positions],
+            self._posting_weights[positions] * np.repeat(word_counts, lengths),
+        )
+
+        return scores
+
+    def predict_bag(self, bag: WordBag, top_k: int = 10) -> dict[str, float]:
+        """
+        Predict the most probable categories of a tokenized document.
+
+        Args:
+            bag: the document's bag of words
+            top_k: the number of categories to return
+
+        Returns:
+            dict mapping category -> probability for the `top_k` most probable
+            categories, in decreasing order of probability. The probabilities
+            are normalized over all categories, so they match `Classifier.predict`.
+        """
+        scores = self.log_scores(bag)
+        top_k = min(top_k, len(scores))
+
+        if top_k <= 0:
+            return {}
+
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        # normalize over every category, not just the top-k
+        max_log = scores[top[0]]
+        total = np.exp(scores - max_log).sum()
+
+        return {
+            self.categories[i]: float(np.exp(scores[i] - max_log) / total) for i in top
+        }
+
+    def predict(self, doc: str, top_k: int = 10) -> dict[str, float]:
+        """
+        Predict the most probable categories of the input document.
+
+        Args:
+            doc: input text string
+            top_k: the number of categories to return
+
+        Returns:
+            dict mapping category -> probability for the `top_k` most probable
+            categories, in decreasing order of probability
+        """
+        return self.predict_bag(WordBag(parse_words(doc)), top_k)
@@ -0,0 +1,284 @@
+"""
+This module contains the memory accounting of trained classifiers.
+
+It measures the bytes held by each component of a `Classifier`, summarizes
+the shape of its vocabulary and counts, and projects the size of the more
+compact representations the model can be converted to (frozen arrays,
+reduced precision, pruning of rare words), to size workers before a model
+reaches production.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .frozen import TABLE_DTYPES
+
+if TYPE_CHECKING:
+    from .classifier import Classifier
+
+
+def deep_sizeof(obj: Any, seen: set[int] | None = None) -> int:
+    """
+    Estimate the memory held by an object and everything it references.
+
+    Objects already in `seen` are not counted again, so sharing one `seen`
+    set across several calls attributes every shared object (e.g. a word
+    string used as a key by several dictionaries) to the first call only.
+
+    Args:
+        obj: the object to measure
+        seen: ids of the objects already counted, updated in place
+
+    Returns:
+        the estimated size of the object graph, in bytes
+    """
+    if seen is None:
+        seen = set()
+
+    pending = [obj]
+    total = 0
+
+    while pending:
+        item = pending.pop()
+
+        if id(item) in seen:
+            continue
+
+        seen.add(id(item))
+
+        # arrays count their data only when they own it, so views and
+        # memory-mapped arrays only count their header
+        total += sys.getsizeof(item)
+
+        if isinstance(item, np.ndarray):
+            continue
+
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+
+        if hasattr(item, "__dict__") and not isinstance(item, type):
+            pending.append(vars(item))
+
+    return total
+
+
+@dataclass(frozen=True)
+class CategoryStats:
+    """
+    The size of a category's word counts.
+
+    Attributes:
+        entries (int): distinct words counted in the category.
+
+        tokens (int): total word tokens counted in the category.
+
+        hapax_entries (int): words counted exactly once in the category.
+    """
+
+    entries: int
+    tokens: int
+    hapax_entries: int
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+    """
+    A breakdown of the memory used by a trained classifier.
+
+    Attributes:
+        components (dict[str, int]): bytes held by each component of the
+            classifier. Objects shared between components are counted once.
+
+        shared_components (dict[str, int]): bytes of components shared by every
+            classifier in the process. The spaCy model is measured by its
+            serialized size, an approximation of its resident memory.
+
+        vocabulary_size (int): the number of distinct words known to the classifier.
+
+        categories (dict[str, CategoryStats]): per-category entry and token counts.
+
+        word_frequency_stats (dict[str, float]): the distribution of the total
+            frequency of every vocabulary word across categories.
+
+        projections (dict[str, int]): the projected bytes of compact
+            representations of the same model.
+    """
+
+    components: dict[str, int]
+    shared_components: dict[str, int]
+    vocabulary_size: int
+    categories: dict[str, CategoryStats]
+    word_frequency_stats: dict[str, float]
+    projections: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_bytes(self) -> int:
+        """
+        The bytes held by the classifier itself, excluding shared components.
+        """
+        return sum(self.components.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the report into plain, JSON-serializable values.
+
+        Returns:
+            the report as nested dictionaries
+        """
+        return {
+            "total_bytes": self.total_bytes,
+            "components": self.components,
+            "shared_components": self.shared_components,
+            "vocabulary_size": self.vocabulary_size,
+            "categories": {
+                name: vars(stats) for name, stats in self.categories.items()
+            },
+            "word_frequency_stats": self.word_frequency_stats,
+            "projections": self.projections,
+        }
+
+
+@cache
+def _nlp_model_serialized_size() -> int:
+    """
+    Measure the serialized size of the spaCy model, once per process.
+    """
+    from .nlp import nlp_model
+
+    return len(nlp_model.to_bytes())
+
+
+def _nlp_model_bytes() -> dict[str, int]:
+    """
+    Measure the spaCy model, if it has been loaded by this process.
+
+    Returns:
+        the serialized size of the model, keyed by component name, or an
+        empty mapping if the model isn't loaded
+    """
+    if f"{__package__}.nlp" not in sys.modules:
+        return {}
+
+    # the serialized size is a practical proxy for the model's footprint,
+    # its Cython structures are invisible to sys.getsizeof. Serializing the
+    # model copies all of it, so it is only done once
+    return {"nlp_model_serialized": _nlp_model_serialized_size()}
+
+
+def memory_report(classifier: "Classifier") -> MemoryReport:
+    """
+    Build the memory report of a trained classifier.
+
+    Args:
+        classifier: the classifier to measure
+
+    Returns:
+        the MemoryReport of `classifier`
+    """
+    seen: set[int] = set()
+    word_frequencies = classifier.word_frequencies_per_category
+
+    # components are measured in this order, each one only counting the
+    # objects the previous ones didn't already hold
+    components = {
+        "vocabulary": deep_sizeof(classifier.vocabulary, seen),
+        "word_frequencies": deep_sizeof(word_frequencies, seen),
+        "likelihoods": deep_sizeof(classifier.word_likelihoods_per_category, seen),
+        "priors": deep_sizeof(classifier.priors, seen),
+        "ngram_sketches": deep_sizeof(classifier.ngram_sketches_per_category, seen),
+    }
+
+    categories = {
+        category: CategoryStats(
+            entries=len(counts),
+            tokens=sum(counts.values()),
+            hapax_entries=sum(1 for n in counts.values() if n == 1),
+        )
+        for category, counts in word_frequencies.items()
+    }
+
+    # sum the sparse per-category counts instead of building the dense
+    # (categories, words) matrix, which can outweigh the model itself
+    vocab = classifier.vocabulary
+    word_totals = np.zeros(len(vocab), dtype=np.int64)
+
+    for counts in word_frequencies.values():
+        word_ids = np.fromiter(
+            (vocab[w] for w in counts), dtype=np.intp, count=len(counts)
+        )
+        # a word appears once per category, so the ids are unique
+        word_totals[word_ids] += np.fromiter(
+            counts.values(), dtype=np.int64, count=len(counts)
+        )
+    word_frequency_stats = (
+        {
+            "tokens": int(word_totals.sum()),
+            "mean": float(word_totals.mean()),
+            "median": float(np.median(word_totals)),
+            "max": int(word_totals.max()),
+            "hapax_words": int(np.count_nonzero(word_totals == 1)),
+        }
+        if len(word_totals)
+        else {}
+    )
+
+    return MemoryReport(
+        components=components,
+        shared_components=_nlp_model_bytes(),
+        vocabulary_size=len(classifier.vocabulary),
+        categories=categories,
+        word_frequency_stats=word_frequency_stats,
+        projections=_projections(classifier, components, categories),
+    )
+
+
+def _projections(
+    classifier: "Classifier",
+    components: dict[str, int],
+    categories: dict[str, CategoryStats],
+) -> dict[str, int]:
+    """
+    Project the size of compact representations of a classifier.
+
+    Args:
+        classifier: the measured classifier
+        components: the measured bytes of each component
+        categories: the per-category entry counts
+
+    Returns:
+        projected bytes, keyed by representation
+    """
+    n_categories = len(classifier.categories)
+    vocabulary_size = len(classifier.vocabulary)
+
+    # a frozen model keeps a copy of the vocabulary mapping, the dense
+    # table, and four float64 vectors of one value per category
+    frozen_overhead = components["vocabulary"] + 4 * 8 * n_categories
+
+    projections = {
+        f"frozen_{dtype}": frozen_overhead
+        + n_categories * vocabulary_size * np.dtype(dtype).itemsize
+        for dtype in TABLE_DTYPES
+    }
+
+    # dropping the words counted once in a category removes their entries
+    # from both the count and likelihood dictionaries
+    entries = sum(stats.entries for stats in categories.values())
+    hapax = sum(stats.hapax_entries for stats in categories.values())
+
+    if entries:
+        per_entry = (
+            components["word_frequencies"] + components["likelihoods"]
+        ) / entries
+        projections["pruned_hapax"] = round(
+            sum(components.values()) - hapax * per_entry
+        )
+
+    return projections
@@ -5,8 +5,20 @@ different sources: individual python strings, file paths,
 and user input (via the builtins.input function)
 """
 
+import re
+from importlib.metadata import PackageNotFoundError, version
 from typing import Iterator
 
+from spacy.lang.en.stop_words import STOP_WORDS
+
+# bump whenever `parse_words` changes the tokens it produces, so that
+# corpora cached with the previous behaviour are invalidated
+TOKEN_FILTER_VERSION = 1
+
+# words, optionally followed by a contraction suffix which spaCy splits
+# into its own token (e.g. "you're" -> "you", "'re")
+_FAST_TOKEN_PATTERN = re.compile(r"\w+|'\w+")
+
 
 def parse_words(text: str) -> list[str]:
     """
@@ -21,18 +33,117 @@ def parse_words(text: str) -> list[str]:
         a list of string tokens that represent the words in
         the input text string
     """
+    return [word for word, _ in parse_word_spans(text)]
+
+
+def parse_word_spans(text: str) -> list[tuple[str, int]]:
+    """
+    Parse words out of a string of text like `parse_words`, along
+    with the position in the text where each word ends.
+
+    Args:
+        text: input string to tokenize and filter into words
+
+    Returns:
+        a list of tuples of a word token, and the offset in the input
+        text string right after the word
+    """
     # lazy import the natural language model module
     from .nlp import nlp_model
 
     tokens = nlp_model(text)
 
     return [
-        t.text.lower()
+        (t.text.lower(), t.idx + len(t.text))
         for t in tokens
         if not t.is_punct and not t.is_space and not t.is_stop and not t.is_digit
     ]
 
 
+def fast_parse_words(text: str) -> list[str]:
+    """
+    Cheaply approximate `parse_words` with a regular expression, without
+    running the natural language model.
+
+    Tokens are lowercased, and stop words and numbers are removed as they
+    are by `parse_words`, but tokenization edge cases (URLs, emoticons,
+    abbreviations, ...) are not handled.
+
+    Args:
+        text: input string to tokenize and filter into words
+
+    Returns:
+        a list of string tokens that approximate the words in
+        the input text string
+    """
+    return [
+        token
+        for token in _FAST_TOKEN_PATTERN.findall(text.lower())
+        if token not in STOP_WORDS and not token.isdigit()
+    ]
+
+
+def iter_chunks(text: str, chunk_size: int) -> Iterator[tuple[str, int]]:
+    """
+    Split a string of text into consecutive chunks of about `chunk_size`
+    characters, without cutting words in half.
+
+    Chunks end at the last space or newline before the size limit, other than
+    a leading one (which would leave a chunk of whitespace only). A chunk is
+    therefore only cut mid-word when it holds a single word too long to fit.
+
+    Args:
+        text: input string to split
+        chunk_size: the maximum number of characters of a chunk
+
+    Yields:
+        tuples of a chunk, and the offset in `text` where the chunk ends
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+
+    start = 0
+
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+
+        if end < len(text):
+            # back off to the last whitespace, unless the chunk has none
+            # past its first character
+            cut = max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+            if cut > start:
+                end = cut + 1
+
+        yield text[start:end], end
+        start = end
+
+
+def tokenizer_config() -> dict[str, str]:
+    """
+    Describe the tokenizer used by `parse_words`, without loading it.
+
+    Two tokenizers with the same configuration produce the same tokens,
+    so this is used to key caches of tokenized text.
+
+    Returns:
+        a mapping of configuration names to their values
+    """
+
+    def package_version(name: str) -> str:
+        try:
+            return version(name)
+        except PackageNotFoundError:
+            return "unknown"
+
+    return {
+        # the model loaded by the `.nlp` module
+        "model": "en_core_web_sm",
+        "model_version": package_version("en_core_web_sm"),
+        "spacy_version": package_version("spacy"),
+        "token_filter_version": str(TOKEN_FILTER_VERSION),
+    }
+
+
 def read_file_words(src: str) -> Iterator[str]:
     """
     Given a file path, read and yield the word tokens
@@ -0,0 +1,216 @@
+"""
+This module contains a count-min sketch, a fixed-size probabilistic
+frequency table used to count features whose exact storage would grow
+without bound (e.g. word n-grams over a very large corpus).
+
+Error bound:
+    A sketch of width `w` and depth `d` answers a frequency query for an
+    item with true count `c` with an estimate `ĉ` such that
+
+        c <= ĉ <= c + ε * N    with probability at least 1 - δ
+
+    where `N` is the total count inserted into the sketch,
+    ε = e / w and δ = exp(-d). Equivalently, a sketch sized with
+    w = ceil(e / ε) and d = ceil(ln(1 / δ)) honours the (ε, δ) guarantee.
+    Estimates never undercount.
+"""
+
+from hashlib import blake2b
+from math import ceil, e, exp, log
+from typing import Iterable
+
+import numpy as np
+
+
+def hash_features(features: Iterable[str]) -> np.ndarray:
+    """
+    Compute a stable 64-bit hash for each feature string.
+
+    The hashes are independent of the interpreter's hash seed, so a sketch
+    built in one process can be queried from another.
+
+    Args:
+        features: the feature strings to hash
+
+    Returns:
+        A numpy array of unsigned 64-bit hashes, one per feature
+    """
+    return np.fromiter(
+        (
+            int.from_bytes(blake2b(f.encode("utf-8"), digest_size=8).digest())
+            for f in features
+        ),
+        dtype=np.uint64,
+    )
+
+
+class CountMinSketch:
+    """
+    A count-min sketch of `depth` rows of `width` counters each.
+
+    Every item is hashed once to 64 bits, and its column in each row is
+    derived by double hashing, so all row indices for a batch of items are
+    computed and gathered in vectorized form. Sketches that share the same
+    width, depth and seed can be queried with the same indices.
+
+    Attributes:
+        width (int): number of counters per row.
+
+        depth (int): number of rows (independent hash functions).
+
+        seed (int): salt mixed into the hashes, sketches with different seeds
+            are not comparable.
+
+        total (int): the total count inserted into the sketch.
+
+        table (np.ndarray): the `(depth, width)` counter array.
+    """
+
+    def __init__(self, width: int = 2**16, depth: int = 4, seed: int = 0):
+        if width <= 0 or depth <= 0:
+            raise ValueError("width and depth must be positive integers")
+
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.total = 0
+        self.table: np.ndarray = np.zeros((depth, width), dtype=np.int64)
+
+    @classmethod
+    def from_error_bound(
+        cls, epsilon: float, delta: float, seed: int = 0
+    ) -> "CountMinSketch":
+        """
+        Create a sketch sized to honour a given (ε, δ) error bound.
+
+        Args:
+            epsilon: the additive error, as a fraction of the total count
+            delta: the probability of exceeding that error
+            seed: salt mixed into the hashes
+
+        Returns:
+            A sketch of width ceil(e / ε) and depth ceil(ln(1 / δ))
+        """
+        if not (0 < epsilon < 1 and 0 < delta < 1):
+            raise ValueError("epsilon and delta must be in the (0, 1) interval")
+
+        return cls(width=ceil(e / epsilon), depth=ceil(log(1 / delta)), seed=seed)
+
+    @classmethod
+    def merge(cls, sketches: Iterable["CountMinSketch"]) -> "CountMinSketch":
+        """
+        Combine several compatible sketches into one counting all their items.
+
+        Args:
+            sketches: sketches sharing the same width, depth and seed
+
+        Returns:
+            A new sketch equivalent to having added every item to a single sketch
+        """
+        sketches = list(sketches)
+
+        if not sketches:
+            raise ValueError("at least one sketch is required")
+
+        first = sketches[0]
+        merged = cls(width=first.width, depth=first.depth, seed=first.seed)
+
+        for sketch in sketches:
+            if (sketch.width, sketch.depth, sketch.seed) != (
+                first.width,
+                first.depth,
+                first.seed,
+            ):
+                raise ValueError("cannot merge sketches of different shapes or seeds")
+
+            merged.table += sketch.table
+            merged.total += sketch.total
+
+        return merged
+
+    def indices(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Compute the column of each hashed item in every row of the sketch.
+
+        Args:
+            hashes: 64-bit item hashes, as returned by `hash_features`
+
+        Returns:
+            A `(depth, len(hashes))` array of column indices
+        """
+        salted = hashes ^ np.uint64(self.seed)
+        h1 = salted & np.uint64(0xFFFFFFFF)
+        h2 = (salted >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+
+        return ((h1 + rows * h2) % np.uint64(self.width)).astype(np.intp)
+
+    def add(self, hashes: np.ndarray, counts: np.ndarray | None = None):
+        """
+        Record occurrences of hashed items in the sketch.
+
+        Args:
+            hashes: 64-bit item hashes, as returned by `hash_features`
+            counts: the number of occurrences of each item, defaults to one each
+        """
+        if counts is None:
+            counts = np.ones(len(hashes), dtype=np.int64)
+
+        idx = self.indices(hashes)
+        rows = np.broadcast_to(np.arange(self.depth)[:, None], idx.shape)
+
+        # np.add.at accumulates correctly when a batch has colliding columns
+        np.add.at(self.table, (rows, idx), counts)
+        self.total += int(counts.sum())
+
+    def estimate_at(self, idx: np.ndarray) -> np.ndarray:
+        """
+        Estimate item counts from precomputed indices.
+
+        Args:
+            idx: a `(depth, n)` array, as returned by `indices`
+
+        Returns:
+            An array of `n` estimated counts
+        """
+        return self.table[np.arange(self.depth)[:, None], idx].min(axis=0)
+
+    def estimate(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Estimate the counts of hashed items.
+
+        Args:
+            hashes: 64-bit item hashes, as returned by `hash_features`
+
+        Returns:
+            An array of estimated counts, never lower than the true counts
+        """
+        return self.estimate_at(self.indices(hashes))
+
+    def error_bound(self) -> tuple[float, float]:
+        """
+        The additive error bound of this sketch's estimates.
+
+        Returns:
+            A tuple `(error, delta)`: an estimate exceeds the true count by more
+            than `error` with probability at most `delta`
+        """
+        return (e / self.width) * self.total, exp(-self.depth)
+
+    def distinct_estimate(self) -> int:
+        """
+        Estimate the number of distinct items inserted into the sketch.
+
+        Uses linear counting on the occupancy of the first row, which is
+        accurate until the row is close to saturation.
+
+        Returns:
+            the estimated number of distinct items
+        """
+        empty = int(np.count_nonzero(self.table[0] == 0))
+
+        if empty == 0:
+            # saturated row, the best we can say is "at least width"
+            return self.width
+
+        return round(-self.width * log(empty / self.width))
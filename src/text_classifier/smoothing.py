@@ -0,0 +1,189 @@
+"""
+This module contains a vectorized sweep over the Laplace/Lidstone
+smoothing parameter of a trained classifier.
+
+The classifier keeps its raw word counts, so the smoothed log-likelihoods
+for any number of candidate `k` values can be evaluated against a
+validation set in one `(n_k, categories, words)` array computation,
+without re-tokenizing or recounting the training data.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from .parser import parse_words
+
+if TYPE_CHECKING:
+    from .classifier import Classifier
+
+
+@dataclass(frozen=True)
+class SmoothingSweep:
+    """
+    The validation results of a set of smoothing parameters.
+
+    Attributes:
+        categories (tuple[str, ...]): category labels, indexing the columns of `ks`.
+
+        ks (np.ndarray): `(n_k, categories)` smoothing parameter of every
+            candidate, per category.
+
+        accuracies (np.ndarray): validation accuracy of every candidate.
+
+        log_losses (np.ndarray): mean negative log-probability of the true
+            category of every validation document, for every candidate.
+    """
+
+    categories: tuple[str, ...]
+    ks: np.ndarray
+    accuracies: np.ndarray
+    log_losses: np.ndarray
+
+    @property
+    def best_index(self) -> int:
+        """
+        The position of the best candidate: highest accuracy first, and
+        lowest log-loss among equally accurate candidates.
+        """
+        return int(np.lexsort((self.log_losses, -self.accuracies))[0])
+
+    @property
+    def best_k(self) -> float | dict[str, float]:
+        """
+        The smoothing parameter of the best candidate, ready to be passed to
+        `Classifier.set_smoothing`. A single float if the candidate uses the
+        same `k` for every category, a per-category mapping otherwise.
+        """
+        ks = self.ks[self.best_index]
+
+        if np.all(ks == ks[0]):
+            return float(ks[0])
+
+        return {c: float(k) for c, k in zip(self.categories, ks)}
+
+
+def _candidate_matrix(
+    ks: Sequence[float | Mapping[str, float]], categories: tuple[str, ...]
+) -> np.ndarray:
+    """
+    Normalize candidate smoothing parameters into a `(n_k, categories)` array.
+
+    Args:
+        ks: candidates, each either a float or a per-category mapping
+        categories: category labels, in classifier order
+
+    Returns:
+        the per-category smoothing parameter of every candidate
+    """
+    return np.array(
+        [
+            [k] * len(categories)
+            if isinstance(k, (int, float))
+            else [k[c] for c in categories]
+            for k in ks
+        ],
+        dtype=np.float64,
+    )
+
+
+def sweep_smoothing(
+    classifier: "Classifier",
+    validation: Iterable[tuple[str, str]],
+    ks: Sequence[float | Mapping[str, float]],
+) -> SmoothingSweep:
+    """
+    Evaluate many smoothing parameters of a trained classifier against a validation set.
+
+    Args:
+        classifier: the trained classifier, whose raw word counts are used
+        validation: tuples where the first element is a document and the second
+            element is the category the document belongs to
+        ks: the candidate smoothing parameters, each either a float shared by
+            every category or a mapping of category -> smoothing parameter
+
+    Returns:
+        A SmoothingSweep with the validation accuracy and log-loss of every candidate
+
+    Raises:
+        ValueError: if the validation set is empty, or if `classifier` counts
+            word n-grams, which the sweep doesn't score
+
+    Example:
+        ```
+        sweep = sweep_smoothing(c, validation, [0.01, 0.1, 0.5, 1.0, 2.0])
+        c.set_smoothing(sweep.best_k)
+        ```
+    """
+    if classifier.ngram_sketches_per_category:
+        raise ValueError("classifiers with word n-gram features can't be swept")
+
+    categories = classifier.categories
+    category_ids = {c: i for i, c in enumerate(categories)}
+    vocab = classifier.vocabulary
+
+    # (n_k, C) candidate parameters, and the (C, V) raw counts
+    k = _candidate_matrix(ks, categories)
+    counts = classifier.word_count_matrix()
+    totals = counts.sum(axis=1)
+
+    # tokenize the validation set, splitting every document into the words
+    # known to the vocabulary, and a count of the unseen ones
+    labels: list[int] = []
+    documents: list[list[int]] = []
+    unseen_counts: list[int] = []
+
+    for doc, label in validation:
+        word_ids = [vocab.index_of(w) for w in parse_words(doc)]
+        known = [i for i in word_ids if i >= 0]
+
+        labels.append(category_ids.get(label.lower(), -1))
+        documents.append(known)
+        unseen_counts.append(len(word_ids) - len(known))
+
+    if not documents:
+        raise ValueError("the validation set must contain at least one document")
+
+    # restrict the vocabulary axis to the words the validation set uses,
+    # and build the dense (D, U) document-word count matrix over them
+    used = np.unique(np.concatenate([np.array(d, dtype=np.intp) for d in documents]))
+    column = np.full(len(vocab), -1, dtype=np.intp)
+    column[used] = np.arange(len(used))
+
+    doc_words = np.zeros((len(documents), len(used)))
+    for d, word_ids in enumerate(documents):
+        np.add.at(doc_words[d], column[word_ids], 1)
+
+    # (n_k, C, 1) log-denominators and (n_k, C, U) smoothed log-likelihoods
+    log_denominators = np.log(totals + k * len(vocab))[:, :, None]
+    log_likelihoods = np.log(counts[None, :, used] + k[:, :, None]) - log_denominators
+    log_unseen = np.log(k)[:, :, None] - log_denominators
+
+    log_priors = np.log([classifier.priors[c] for c in categories])
+
+    # (n_k, D, C) unnormalized log-posteriors
+    scores = (
+        np.einsum("kcu,du->kdc", log_likelihoods, doc_words)
+        + np.array(unseen_counts)[None, :, None] * log_unseen.transpose(0, 2, 1)
+        + log_priors
+    )
+
+    labels_array = np.array(labels)
+    accuracies = (scores.argmax(axis=2) == labels_array).mean(axis=1)
+
+    # log-loss over the documents whose category the classifier knows
+    known_labels = labels_array >= 0
+    max_scores = scores.max(axis=2, keepdims=True)
+    log_normalizers = max_scores[:, :, 0] + np.log(
+        np.exp(scores - max_scores).sum(axis=2)
+    )
+    true_scores = scores[:, known_labels, labels_array[known_labels]]
+    log_losses = (log_normalizers[:, known_labels] - true_scores).mean(axis=1)
+
+    return SmoothingSweep(
+        categories=categories,
+        ks=k,
+        accuracies=accuracies,
+        log_losses=log_losses,
+    )
@@ -0,0 +1,65 @@
+"""
+This module contains the on-disk format shared by the array-backed models.
+
+An array-backed object is stored as a directory holding one `.npy` file per
+array, which can be memory-mapped on load, and a JSON side file with the
+metadata that doesn't fit in an array, such as the words of a vocabulary.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+
+# name of the JSON side file of a saved directory
+_METADATA_FILE = "vocabulary.json"
+
+
+def save_arrays(
+    directory: str | Path, arrays: Mapping[str, np.ndarray], metadata: dict[str, Any]
+):
+    """
+    Write arrays and their JSON metadata to a directory.
+
+    Args:
+        directory: the directory to write to, created if missing
+        arrays: the arrays to write, keyed by file name (without `.npy`)
+        metadata: JSON-serializable values written to the side file
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for name, array in arrays.items():
+        np.save(directory / f"{name}.npy", array)
+
+    with open(directory / _METADATA_FILE, "w") as f:
+        json.dump(metadata, f)
+
+
+def load_arrays(
+    directory: str | Path, names: Iterable[str], mmap: bool = True
+) -> tuple[dict[str, np.ndarray], dict[str, Any]]:
+    """
+    Read arrays and their JSON metadata written by `save_arrays`.
+
+    Args:
+        directory: the directory to read from
+        names: the names of the arrays to read
+        mmap: memory-map the arrays read-only instead of reading them into memory
+
+    Returns:
+        A tuple `(arrays, metadata)` of the arrays keyed by name, and the
+        values of the side file
+    """
+    directory = Path(directory)
+    mmap_mode = "r" if mmap else None
+
+    arrays = {
+        name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode) for name in names
+    }
+
+    with open(directory / _METADATA_FILE) as f:
+        metadata = json.load(f)
+
+    return arrays, metadata
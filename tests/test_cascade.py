@@ -0,0 +1,70 @@
+from pytest import approx
+
+from text_classifier.cascade import CascadeClassifier
+
+from .utils import trained_classifier
+
+# short spam and legit messages
+SPAM_DATASET = [
+    ("free entry to win cash now", "spam"),
+    ("win a free prize, claim now", "spam"),
+    ("urgent: claim your cash prize", "spam"),
+    ("are we still meeting for lunch", "legit"),
+    ("running late, see you at lunch", "legit"),
+    ("call me when you get home", "legit"),
+]
+
+
+def test_cascade_fast_exit():
+    c = trained_classifier(SPAM_DATASET)
+    cascade = CascadeClassifier(c, threshold=0.9)
+
+    doc = "free cash prize, claim now! win win win"
+    result = cascade.predict(doc)
+
+    assert max(result, key=result.__getitem__) == "spam"
+    assert cascade.stats.requests == 1
+    assert cascade.stats.fall_throughs == 0
+
+
+def test_cascade_falls_through_when_uncertain():
+    c = trained_classifier(SPAM_DATASET)
+    cascade = CascadeClassifier(c, threshold=0.9)
+
+    # nothing the classifier has seen, so the fast stage can't be confident
+    doc = "gabagool"
+    result = cascade.predict(doc)
+
+    for category, probability in c.predict(doc).items():
+        assert approx(result[category]) == probability
+
+    stats = cascade.stats
+    assert stats.fall_throughs == 1
+    assert stats.fall_through_rate == 1.0
+    assert stats.fall_through_agreements == 1
+    assert stats.fall_through_agreement_rate == 1.0
+    # nothing was audited, so there is no disagreement to report
+    assert stats.audits == 0
+    assert stats.audit_agreement_rate == 1.0
+    assert stats.full_seconds > 0
+
+
+def test_cascade_audits():
+    c = trained_classifier(SPAM_DATASET)
+    cascade = CascadeClassifier(c, threshold=0.9, audit_rate=1.0)
+
+    for _ in range(3):
+        cascade.predict("free cash prize, claim now! win win win")
+
+    stats = cascade.stats
+    assert stats.requests == 3
+    assert stats.audits == 3
+    assert stats.audit_agreements == 3
+    assert stats.audit_agreement_rate == 1.0
+    assert stats.fall_through_agreements == 0
+
+    # audits are measured, but not counted against the cascade's latency
+    assert stats.mean_latency == approx(stats.fast_seconds / 3)
+
+    cascade.reset_stats()
+    assert cascade.stats.requests == 0
@@ -1,6 +1,10 @@
+from unittest.mock import patch
+
 from pytest import approx
 
 from text_classifier.classifier import Classifier
+from text_classifier.corpus import TokenizedCorpus
+from text_classifier.parser import parse_word_spans
 
 
 def test_classifier_training():
@@ -45,3 +49,120 @@ def test_classifier_training():
     unseen_word = "blah"
     assert approx(likelihoods["positive"][unseen_word], 0.01) == 1 / 8
     assert approx(likelihoods["negative"][unseen_word], 0.01) == 1 / 6
+
+
+def test_classifier_ngram_features():
+    test_dataset = [
+        ("free entry to win cash", "spam"),
+        ("free entry today", "spam"),
+        ("entry free lunch with the team", "legit"),
+        ("lunch today with the team", "legit"),
+    ]
+
+    unigrams = Classifier()
+    unigrams.train(test_dataset)
+
+    bigrams = Classifier(ngram_size=2, sketch_width=1024, sketch_depth=3)
+    bigrams.train(test_dataset)
+
+    assert unigrams.ngram_sketches_per_category == {}
+    assert set(bigrams.ngram_sketches_per_category) == {"spam", "legit"}
+
+    spam_sketch = bigrams.ngram_sketches_per_category["spam"]
+    assert spam_sketch.table.shape == (3, 1024)
+
+    # unigrams alone can't tell the word order apart
+    assert (
+        approx(unigrams.predict("free entry")["spam"])
+        == unigrams.predict("entry free")["spam"]
+    )
+
+    # the "free entry" bigram only appears in spam
+    assert bigrams.predict("free entry")["spam"] > bigrams.predict("entry free")["spam"]
+    assert approx(sum(bigrams.predict("free entry").values())) == 1.0
+
+
+def test_classifier_training_from_corpus():
+    test_dataset = [
+        ("love my cat", "positive"),
+        ("love my dog", "positive"),
+        ("hate my cat", "Negative"),
+    ]
+
+    expected = Classifier()
+    expected.train(test_dataset, k=1)
+
+    c = Classifier()
+    c.train(TokenizedCorpus.from_dataset(test_dataset), k=1)
+
+    assert dict(c.vocabulary) == dict(expected.vocabulary)
+    assert c.priors == expected.priors
+    assert c.word_frequencies_per_category == expected.word_frequencies_per_category
+    assert c.word_likelihoods_per_category == expected.word_likelihoods_per_category
+    assert c.predict("love cat") == expected.predict("love cat")
+
+
+def test_classifier_predict_stream():
+    test_dataset = [
+        ("love my cat", "positive"),
+        ("love my dog", "positive"),
+        ("hate my cat", "negative"),
+    ]
+
+    c = Classifier()
+    c.train(test_dataset, k=1)
+
+    doc = " ".join(["love cat"] * 200 + ["hate dog"] * 200)
+
+    # without limits, the whole document is scored like predict() does
+    full = c.predict_stream(doc, chunk_size=64)
+    assert full.stop_reason == "exhausted"
+    assert full.tokens_consumed == 800
+    assert full.fraction_consumed == 1.0
+    for category, probability in c.predict(doc).items():
+        assert approx(full.probabilities[category]) == probability
+
+    # the first chunks are clearly positive, so scoring stops early
+    confident = c.predict_stream(doc, chunk_size=64, confidence_margin=5.0)
+    assert confident.stop_reason == "confidence"
+    assert confident.chars_consumed < len(doc) / 4
+    assert confident.probabilities["positive"] > 0.99
+
+    budgeted = c.predict_stream(doc, chunk_size=64, token_budget=25)
+    assert budgeted.stop_reason == "token_budget"
+    assert budgeted.tokens_consumed == 25
+    # only the characters up to the last scored word are consumed
+    assert doc[: budgeted.chars_consumed].split() == ["love", "cat"] * 12 + ["love"]
+
+    # the budget runs out at the end of the second chunk
+    short = c.predict_stream("love cat hate dog", chunk_size=5, token_budget=2)
+    assert short.stop_reason == "token_budget"
+    assert short.chars_consumed == len("love cat ")
+
+
+def test_classifier_predict_stream_char_budget():
+    c = Classifier()
+    c.train([("love my cat", "positive"), ("hate my cat", "negative")], k=1)
+
+    # no word survives filtering, so the token budget is never used up
+    doc = "the and of to !!! 123 " * 1000
+
+    with patch(
+        "text_classifier.classifier.parse_word_spans", wraps=parse_word_spans
+    ) as tokenize:
+        unbounded = c.predict_stream(doc, chunk_size=64, token_budget=10)
+
+    assert unbounded.stop_reason == "exhausted"
+    assert unbounded.tokens_consumed == 0
+    assert tokenize.call_count > 100
+
+    # the character budget bounds the tokenization work regardless of content
+    with patch(
+        "text_classifier.classifier.parse_word_spans", wraps=parse_word_spans
+    ) as tokenize:
+        bounded = c.predict_stream(doc, chunk_size=64, token_budget=10, char_budget=200)
+
+    assert bounded.stop_reason == "char_budget"
+    assert bounded.chars_consumed <= 200
+    assert sum(len(call.args[0]) for call in tokenize.call_args_list) <= 200
+    assert doc[: bounded.chars_consumed].endswith(" ")
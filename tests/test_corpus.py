@@ -0,0 +1,83 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+
+from text_classifier.corpus import TokenizedCorpus, fingerprint, load_or_build
+
+
+def test_tokenized_corpus_from_dataset():
+    corpus = TokenizedCorpus.from_dataset(
+        [
+            ("love my cat", "Positive"),
+            ("hate my cat", "negative"),
+            ("love love dog", "positive"),
+        ]
+    )
+
+    assert len(corpus) == 3
+    assert corpus.words == ["love", "cat", "hate", "dog"]
+    assert corpus.categories == ("positive", "negative")
+
+    assert list(corpus.labels) == [0, 1, 0]
+    assert list(corpus.offsets) == [0, 2, 4, 7]
+    assert list(corpus.document(2)) == [0, 0, 3]
+    assert list(corpus.document_lengths()) == [2, 2, 3]
+
+
+def test_tokenized_corpus_counts():
+    corpus = TokenizedCorpus.from_tokenized(
+        [
+            (["love", "cat"], "positive"),
+            (["hate", "cat"], "negative"),
+            (["love", "love", "dog"], "positive"),
+        ]
+    )
+
+    # rows are categories, columns are words: love, cat, hate, dog
+    assert corpus.word_counts().tolist() == [[3, 1, 0, 1], [0, 1, 1, 0]]
+    assert corpus.document_counts().tolist() == [2, 1]
+
+    subset = np.array([1, 2])
+    assert corpus.word_counts(subset).tolist() == [[2, 0, 0, 1], [0, 1, 1, 0]]
+    assert corpus.document_counts(subset).tolist() == [1, 1]
+
+    tokens, token_documents = corpus.subset_tokens(subset)
+    assert tokens.tolist() == [2, 1, 0, 0, 3]
+    assert token_documents.tolist() == [0, 0, 1, 1, 1]
+
+
+def test_tokenized_corpus_save_and_load():
+    corpus = TokenizedCorpus.from_tokenized(
+        [(["love", "cat"], "positive"), (["hate", "cat"], "negative")]
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus.save(directory)
+        loaded = TokenizedCorpus.load(directory)
+
+        assert isinstance(loaded.tokens, np.memmap)
+        assert loaded.tokens.dtype == np.int32
+        assert loaded.words == corpus.words
+        assert loaded.categories == corpus.categories
+        assert loaded.word_counts().tolist() == corpus.word_counts().tolist()
+
+
+def test_load_or_build_caches_by_fingerprint():
+    dataset = [("love my cat", "positive"), ("hate my cat", "negative")]
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = load_or_build(dataset, directory)
+        assert os.listdir(directory) == [fingerprint(dataset)]
+
+        # a cache hit doesn't tokenize again
+        with patch("text_classifier.corpus.parse_words") as parse_words:
+            cached = load_or_build(dataset, directory)
+            parse_words.assert_not_called()
+
+        assert cached.tokens.tolist() == corpus.tokens.tolist()
+
+        # a different dataset gets its own cache entry
+        load_or_build(dataset[:1], directory)
+        assert len(os.listdir(directory)) == 2
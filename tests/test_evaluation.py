@@ -0,0 +1,70 @@
+import numpy as np
+from pytest import approx
+
+from text_classifier.classifier import Classifier
+from text_classifier.corpus import TokenizedCorpus
+from text_classifier.evaluation import (
+    EvaluationReport,
+    cross_validate,
+    kfold_splits,
+    score_held_out,
+)
+
+from .utils import SAMPLE_DATASET
+
+# two more documents, to split evenly into four folds
+TEST_DATASET = SAMPLE_DATASET + [
+    ("love this lovely day", "positive"),
+    ("hate rainy weather", "negative"),
+]
+
+
+def test_kfold_splits_partition_documents():
+    splits = kfold_splits(10, 3, seed=1)
+
+    assert len(splits) == 3
+    assert sorted(np.concatenate(splits).tolist()) == list(range(10))
+
+
+def test_score_held_out_matches_retraining():
+    corpus = TokenizedCorpus.from_dataset(TEST_DATASET)
+    word_counts = corpus.word_counts()
+    document_counts = corpus.document_counts()
+
+    for held_out in kfold_splits(len(corpus), 4, seed=0):
+        scores = score_held_out(corpus, word_counts, document_counts, held_out, k=0.5)
+
+        # retrain a classifier from scratch on the remaining documents
+        training = [d for i, d in enumerate(TEST_DATASET) if i not in set(held_out)]
+        c = Classifier()
+        c.train(training, k=0.5)
+
+        for row, i in zip(scores, held_out):
+            probabilities = np.exp(row - row.max())
+            probabilities /= probabilities.sum()
+
+            expected = c.predict(TEST_DATASET[i][0])
+            for j, category in enumerate(corpus.categories):
+                assert approx(probabilities[j]) == expected.get(category, 0.0)
+
+
+def test_cross_validate():
+    report = cross_validate(TEST_DATASET, folds=4, seed=0)
+
+    assert report.categories == ("positive", "negative")
+    assert report.confusion.sum() == len(TEST_DATASET)
+    assert len(report.fold_accuracies) == 4
+    assert approx(report.accuracy) == np.mean(report.fold_accuracies)
+
+
+def test_evaluation_report_metrics():
+    report = EvaluationReport(
+        categories=("spam", "legit"),
+        confusion=np.array([[3, 1], [2, 4]]),
+    )
+
+    assert approx(report.accuracy) == 7 / 10
+    assert approx(report.precision["spam"]) == 3 / 5
+    assert approx(report.precision["legit"]) == 4 / 5
+    assert approx(report.recall["spam"]) == 3 / 4
+    assert approx(report.recall["legit"]) == 4 / 6
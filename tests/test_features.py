@@ -1,6 +1,6 @@
 from pytest import mark
 
-from text_classifier.features import Vocabulary, WordBag, vectorize
+from text_classifier.features import Vocabulary, WordBag, ngrams, vectorize
 
 
 def test_vocabulary_registration_no_repetition():
@@ -51,6 +51,21 @@ def test_vocabulary_registration_with_repetition():
     assert v.word_at(10) is None
 
 
+def test_vocabularies_do_not_share_reverse_mapping():
+    first = Vocabulary()
+    first.register(["cat", "dog"])
+
+    second = Vocabulary()
+    second.register(["fish"])
+
+    # each vocabulary only resolves the indices of its own words
+    assert first.word_at(0) == "cat"
+    assert first.word_at(1) == "dog"
+
+    assert second.word_at(0) == "fish"
+    assert second.word_at(1) is None
+
+
 def test_word_bag():
     words = ["word", "word", "test", "word", "scan", "gabagool"]
 
@@ -108,3 +123,20 @@ def test_vectorize(words: list[str], expected: list[int]):
 
     result = vectorize(bag, v)
     assert list(result) == expected
+
+
+@mark.parametrize(
+    "words,max_n,expected",
+    [
+        (["free", "entry", "wkly"], 2, ["free entry", "entry wkly"]),
+        (
+            ["free", "entry", "wkly"],
+            3,
+            ["free entry", "entry wkly", "free entry wkly"],
+        ),
+        (["free"], 2, []),
+        ([], 3, []),
+    ],
+)
+def test_ngrams(words: list[str], max_n: int, expected: list[str]):
+    assert ngrams(words, max_n) == expected
@@ -0,0 +1,120 @@
+import tempfile
+
+import numpy as np
+from pytest import approx, mark, raises
+
+from text_classifier.features import WordBag
+from text_classifier.frozen import FrozenClassifier, compare_precision, quantize
+
+from .utils import trained_classifier
+
+TEST_DOCUMENTS = ["love cat", "awful awful dog", "sunny gabagool", "", "rainy day"]
+
+
+def test_frozen_classifier_matches_classifier():
+    c = trained_classifier()
+
+    frozen = c.freeze()
+
+    assert frozen.dtype == "float64"
+    assert frozen.table.shape == (2, len(c.vocabulary))
+
+    for doc in TEST_DOCUMENTS:
+        expected = c.predict(doc)
+        for category, probability in frozen.predict(doc).items():
+            assert approx(probability) == expected[category]
+
+
+@mark.parametrize("dtype", ["float32", "int16", "int8"])
+def test_frozen_classifier_reduced_precision(dtype: str):
+    c = trained_classifier()
+
+    reference = c.freeze()
+    frozen = c.freeze(dtype)
+
+    assert frozen.dtype == dtype
+    assert frozen.nbytes < reference.nbytes
+
+    report = compare_precision(reference, frozen, TEST_DOCUMENTS)
+
+    assert report.documents == len(TEST_DOCUMENTS)
+    assert report.argmax_change_rate == 0.0
+    assert report.max_probability_error < 0.05
+
+
+def test_quantize_error_bound():
+    rng = np.random.default_rng(0)
+    table = np.log(rng.uniform(1e-6, 1, size=(3, 50)))
+
+    quantized, scale, offset = quantize(table, "int8")
+    restored = quantized * scale[:, None] + offset[:, None]
+
+    assert quantized.dtype == np.int8
+    assert np.all(np.abs(restored - table) <= scale[:, None] / 2 + 1e-12)
+
+
+def test_frozen_classifier_save_and_load():
+    c = trained_classifier()
+
+    frozen = c.freeze("int8")
+
+    with tempfile.TemporaryDirectory() as directory:
+        frozen.save(directory)
+        loaded = FrozenClassifier.load(directory)
+
+        assert loaded.dtype == "int8"
+        assert loaded.words == frozen.words
+        assert loaded.categories == frozen.categories
+
+        bag = WordBag(["love", "awful", "gabagool"])
+        assert loaded.predict_bag(bag) == frozen.predict_bag(bag)
+
+
+def test_frozen_classifier_rejects_unknown_dtype():
+    c = trained_classifier()
+
+    with raises(ValueError):
+        c.freeze("float16")
+
+
+def test_frozen_classifier_rejects_ngram_classifier():
+    c = trained_classifier(ngram_size=2)
+
+    with raises(ValueError):
+        c.freeze()
+
+
+def test_frozen_classifier_is_immutable():
+    c = trained_classifier()
+
+    frozen = c.freeze()
+
+    with raises(AttributeError):
+        frozen.table = np.zeros((2, 2))
+
+    with raises(AttributeError):
+        del frozen.words
+
+    with raises(ValueError):
+        frozen.table[0, 0] = 0.0
+
+    with raises(TypeError):
+        frozen.words["gabagool"] = 0
+
+
+@mark.parametrize("dtype", ["float64", "int8"])
+def test_frozen_classifier_predict_many(dtype: str):
+    c = trained_classifier()
+
+    frozen = c.freeze(dtype)
+    documents = [["love", "cat"], [], ["gabagool"], ["awful", "awful", "dog"]] * 50
+
+    expected = [frozen.predict_bag(WordBag(words)) for words in documents]
+    results = frozen.predict_many(documents, max_workers=4, batch_size=7)
+
+    assert len(results) == len(documents)
+    for result, probabilities in zip(results, expected):
+        assert approx(result) == probabilities
+
+    # text documents are tokenized before scoring
+    assert approx(frozen.predict_many(["love cat"])[0]) == frozen.predict("love cat")
@@ -0,0 +1,52 @@
+from pytest import approx, raises
+
+from text_classifier.index import InvertedIndex
+
+from .utils import SAMPLE_DATASET, trained_classifier
+
+# extra categories, so top-k has more than two candidates to rank
+TEST_DATASET = SAMPLE_DATASET + [
+    ("the weather is cloudy and grey", "weather"),
+    ("sunny weather all week", "weather"),
+    ("my dog chased the neighbour's cat", "pets"),
+]
+
+
+def test_inverted_index_matches_classifier():
+    c = trained_classifier(TEST_DATASET)
+
+    index = InvertedIndex.from_classifier(c)
+
+    # one posting per nonzero (word, category) count
+    assert index.postings_count == sum(
+        len(counts) for counts in c.word_frequencies_per_category.values()
+    )
+
+    for doc in ["love my cat", "grey weather", "dog dog dog", "gabagool", ""]:
+        expected = c.predict(doc)
+        result = index.predict(doc, top_k=len(c.categories))
+
+        assert set(result) == set(expected)
+        for category, probability in result.items():
+            assert approx(probability) == expected[category]
+
+
+def test_inverted_index_top_k():
+    c = trained_classifier(TEST_DATASET)
+
+    index = InvertedIndex.from_classifier(c)
+    expected = sorted(c.predict("sunny cat").items(), key=lambda x: -x[1])
+
+    result = index.predict("sunny cat", top_k=2)
+
+    assert list(result) == [category for category, _ in expected[:2]]
+    assert approx(list(result.values())) == [p for _, p in expected[:2]]
+
+    assert index.predict("sunny cat", top_k=0) == {}
+
+
+def test_inverted_index_rejects_ngram_classifier():
+    c = trained_classifier(ngram_size=2)
+
+    with raises(ValueError):
+        InvertedIndex.from_classifier(c)
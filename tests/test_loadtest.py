@@ -0,0 +1,117 @@
+import asyncio
+import json
+import tempfile
+
+import httpx
+from fastapi import FastAPI, HTTPException
+from pytest import raises
+
+from api.loadtest import (
+    LoadRequest,
+    load_requests,
+    parse_request,
+    run_load,
+    synthesize_requests,
+)
+from api.models import UserInputText
+
+# a stand-in for the API, so the harness can be tested without training a model
+app = FastAPI()
+
+
+@app.post("/predict/")
+async def predict(data: UserInputText):
+    if data.text == "fail":
+        raise HTTPException(status_code=500)
+    if data.text == "crash":
+        raise RuntimeError("boom")
+    return {"spam": 0.5, "legit": 0.5}
+
+
+def make_client(raise_app_exceptions: bool = True) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(
+            app=app, raise_app_exceptions=raise_app_exceptions
+        ),
+        base_url="http://testserver",
+    )
+
+
+def test_parse_request():
+    assert parse_request({"text": "hello"}) == LoadRequest(
+        "POST", "/predict/", {"text": "hello"}
+    )
+    assert parse_request({"title": "t", "body": "hello"}) == LoadRequest(
+        "POST", "/predict/", {"text": "hello"}
+    )
+    assert parse_request({"method": "GET", "path": "/categories"}) == LoadRequest(
+        "GET", "/categories"
+    )
+
+    with raises(ValueError):
+        parse_request({"title": "no text"})
+
+
+def test_load_requests():
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl") as log:
+        log.write(json.dumps({"request_id": "a", "body": "free entry"}) + "\n\n")
+        log.write(json.dumps({"request_id": "b", "body": "see you soon"}) + "\n")
+        log.flush()
+
+        requests = load_requests(log.name)
+
+    assert [r.json["text"] for r in requests] == ["free entry", "see you soon"]
+
+
+def test_run_load_closed_loop():
+    requests = synthesize_requests(20) + [
+        LoadRequest("POST", "/predict/", {"text": "fail"})
+    ]
+
+    async def run():
+        async with make_client() as client:
+            return await run_load(client, requests, concurrency=4)
+
+    report = asyncio.run(run())
+
+    assert report.requests == 21
+    assert report.statuses == {200: 20, 500: 1}
+    assert report.errors == 1
+    assert report.throughput > 0
+    assert 0 < report.percentile(50) <= report.percentile(99)
+
+
+def test_run_load_app_exceptions():
+    requests = synthesize_requests(5) + [
+        LoadRequest("POST", "/predict/", {"text": "crash"})
+    ]
+
+    async def run(raise_app_exceptions: bool):
+        async with make_client(raise_app_exceptions) as client:
+            return await run_load(client, requests, concurrency=2)
+
+    # an exception raised into the harness is counted as a failed request
+    report = asyncio.run(run(raise_app_exceptions=True))
+
+    assert report.requests == 6
+    assert report.statuses == {200: 5, None: 1}
+    assert report.errors == 1
+
+    # an exception returned as a response is counted by its status
+    report = asyncio.run(run(raise_app_exceptions=False))
+
+    assert report.statuses == {200: 5, 500: 1}
+
+
+def test_run_load_open_loop():
+    async def run():
+        async with make_client() as client:
+            return await run_load(
+                client, synthesize_requests(10), concurrency=2, rate=1000.0
+            )
+
+    report = asyncio.run(run())
+
+    assert report.requests == 10
+    assert report.error_rate == 0.0
+    assert "throughput" in report.summary()
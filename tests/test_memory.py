@@ -0,0 +1,97 @@
+import json
+from unittest.mock import patch
+
+import numpy as np
+
+from text_classifier import memory
+from text_classifier.memory import deep_sizeof
+
+from .utils import trained_classifier
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    word = "gabagool" * 10
+    counts = {word: 1}
+    likelihoods = {word: 0.5}
+
+    seen: set[int] = set()
+    first = deep_sizeof(counts, seen)
+    second = deep_sizeof(likelihoods, seen)
+
+    # the shared key is attributed to the first mapping only
+    assert first > deep_sizeof(likelihoods)
+    assert second < deep_sizeof(likelihoods)
+
+
+def test_deep_sizeof_arrays():
+    array = np.zeros(1000)
+
+    assert deep_sizeof(array) >= array.nbytes
+    assert deep_sizeof(array[:10]) < array.nbytes
+
+
+def test_classifier_memory_report():
+    c = trained_classifier()
+
+    report = c.memory_report()
+
+    assert report.vocabulary_size == 9
+    assert set(report.components) == {
+        "vocabulary",
+        "word_frequencies",
+        "likelihoods",
+        "priors",
+        "ngram_sketches",
+    }
+    # only the empty sketch mapping, without n-gram features
+    assert report.components["ngram_sketches"] < 1024
+    assert report.total_bytes == sum(report.components.values())
+
+    assert report.categories["positive"].entries == 6
+    assert report.categories["positive"].tokens == 7
+    assert report.categories["positive"].hapax_entries == 5
+    assert report.word_frequency_stats["tokens"] == 15
+    assert report.word_frequency_stats["max"] == 2
+
+    projections = report.projections
+    assert projections["frozen_int8"] < projections["frozen_float32"]
+    assert projections["frozen_float32"] < projections["frozen_float64"]
+    assert projections["pruned_hapax"] < report.total_bytes
+
+    # the report can be served as JSON
+    assert json.loads(json.dumps(report.to_dict()))["vocabulary_size"] == 9
+
+
+def test_classifier_memory_report_ngram_sketches():
+    c = trained_classifier(ngram_size=2, sketch_width=1024, sketch_depth=2)
+
+    report = c.memory_report()
+
+    # one fixed-size sketch per category
+    assert report.components["ngram_sketches"] >= 2 * 1024 * 2 * 8
+
+
+def test_memory_report_serializes_nlp_model_once():
+    c = trained_classifier()
+
+    from text_classifier.nlp import nlp_model
+
+    memory._nlp_model_serialized_size.cache_clear()
+
+    with patch.object(nlp_model, "to_bytes", wraps=nlp_model.to_bytes) as to_bytes:
+        first = c.memory_report()
+        second = c.memory_report()
+
+    to_bytes.assert_called_once()
+
+    assert first.shared_components == second.shared_components
+    assert first.shared_components["nlp_model_serialized"] > 0
+
+
+def test_memory_report_does_not_build_dense_counts():
+    c = trained_classifier()
+
+    with patch.object(c, "word_count_matrix", side_effect=AssertionError):
+        report = c.memory_report()
+
+    assert report.word_frequency_stats["tokens"] == 15
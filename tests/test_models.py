@@ -0,0 +1,33 @@
+from pydantic import ValidationError
+from pytest import mark, raises
+
+from api.models import (
+    MAX_CHAR_BUDGET,
+    MAX_CHUNK_SIZE,
+    MAX_TOKEN_BUDGET,
+    StreamingInputText,
+)
+
+
+def test_streaming_input_defaults_are_bounded():
+    data = StreamingInputText(text="free entry")
+
+    assert 0 < data.chunk_size <= MAX_CHUNK_SIZE
+    assert 0 < data.token_budget <= MAX_TOKEN_BUDGET
+    assert 0 < data.char_budget <= MAX_CHAR_BUDGET
+
+
+@mark.parametrize(
+    "options",
+    [
+        {"token_budget": None},
+        {"token_budget": MAX_TOKEN_BUDGET + 1},
+        {"chunk_size": MAX_CHUNK_SIZE + 1},
+        {"chunk_size": 0},
+        {"char_budget": None},
+        {"char_budget": MAX_CHAR_BUDGET + 1},
+    ],
+)
+def test_streaming_input_rejects_unbounded_requests(options: dict):
+    with raises(ValidationError):
+        StreamingInputText(text="free entry", **options)
@@ -3,7 +3,12 @@ from unittest.mock import patch
 
 from pytest import mark
 
-from text_classifier.parser import parse_words, read_file_words, read_user_input_words
+from text_classifier.parser import (
+    iter_chunks,
+    parse_words,
+    read_file_words,
+    read_user_input_words,
+)
 
 from .utils import filter_stop_words
 
@@ -140,3 +145,24 @@ def test_read_user_input_tokens(text: str, expected: list[str]):
     with patch("builtins.input", return_value=text):
         words = list(read_user_input_words("please enter some text:"))
         assert words == filter_stop_words(expected)
+
+
+@mark.parametrize(
+    "text,chunk_size,expected",
+    [
+        ("", 4, []),
+        ("short", 10, ["short"]),
+        ("free entry wkly comp", 11, ["free entry ", "wkly comp"]),
+        ("free\nentry wkly", 8, ["free\n", "entry ", "wkly"]),
+        # a chunk without whitespace is cut mid-word
+        ("gabagool madone", 4, ["gaba", "gool", " mad", "one"]),
+        # so is a chunk whose only whitespace is leading
+        ("abcd\nefghij", 4, ["abcd", "\nefg", "hij"]),
+    ],
+)
+def test_iter_chunks(text: str, chunk_size: int, expected: list[str]):
+    chunks = list(iter_chunks(text, chunk_size))
+
+    assert [chunk for chunk, _ in chunks] == expected
+    assert "".join(chunk for chunk, _ in chunks) == text
+    assert all(text[:end].endswith(chunk) for chunk, end in chunks)
@@ -0,0 +1,106 @@
+import inspect
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pytest import approx, raises
+
+from api.registry import ModelRegistry, make_router
+from text_classifier import Classifier
+from text_classifier.parser import parse_words
+
+from .utils import trained_classifier
+
+
+def make_registry() -> ModelRegistry:
+    registry = ModelRegistry()
+    registry.register(
+        "spam",
+        trained_classifier([("free cash prize", "spam"), ("lunch at noon", "legit")]),
+    )
+    registry.register(
+        "priority",
+        trained_classifier([("urgent call now", "high"), ("lunch at noon", "low")]),
+    )
+    return registry
+
+
+def test_registry_routes_by_name():
+    registry = make_registry()
+
+    assert registry.names() == ["spam", "priority"]
+    assert "spam" in registry
+    assert "language" not in registry
+
+    assert registry.predict("spam", "free lunch") == registry.get("spam").predict(
+        "free lunch"
+    )
+
+    with raises(KeyError):
+        registry.predict("language", "free lunch")
+
+    with raises(ValueError):
+        registry.register("spam", Classifier())
+
+
+def test_registry_fan_out_tokenizes_once():
+    registry = make_registry()
+
+    with patch("api.registry.parse_words", wraps=parse_words) as tokenize:
+        results = registry.predict_all("urgent: free cash now")
+
+    tokenize.assert_called_once()
+
+    assert set(results) == {"spam", "priority"}
+    assert results["spam"] == registry.get("spam").predict("urgent: free cash now")
+    assert results["priority"] == registry.get("priority").predict(
+        "urgent: free cash now"
+    )
+
+    assert set(registry.predict_all("urgent", ["priority"])) == {"priority"}
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(make_router(make_registry()))
+    return TestClient(app)
+
+
+def test_router_serves_named_models():
+    client = make_client()
+    registry = make_registry()
+
+    assert client.get("/models").json() == ["spam", "priority"]
+
+    response = client.post("/models/priority/predict", json={"text": "urgent call"})
+    assert response.status_code == 200
+    assert response.json() == approx(registry.predict("priority", "urgent call"))
+
+    response = client.post("/models/language/predict", json={"text": "urgent call"})
+    assert response.status_code == 404
+
+    response = client.get("/models/spam/memory")
+    assert response.status_code == 200
+    assert response.json()["vocabulary_size"] == len(registry.get("spam").vocabulary)
+
+
+def test_router_fan_out():
+    client = make_client()
+
+    response = client.post(
+        "/predict/fanout/", json={"text": "free lunch", "models": ["spam"]}
+    )
+    assert response.status_code == 200
+    assert set(response.json()) == {"spam"}
+
+    response = client.post(
+        "/predict/fanout/", json={"text": "free lunch", "models": ["language"]}
+    )
+    assert response.status_code == 404
+
+
+def test_router_handlers_run_on_the_event_loop():
+    router = make_router(make_registry())
+
+    # synchronous handlers would run in a thread pool, sharing spaCy across threads
+    assert all(inspect.iscoroutinefunction(route.endpoint) for route in router.routes)
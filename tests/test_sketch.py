@@ -0,0 +1,65 @@
+from math import e, exp
+
+import numpy as np
+from pytest import raises
+
+from text_classifier.sketch import CountMinSketch, hash_features
+
+
+def test_hash_features_is_stable():
+    hashes = hash_features(["free entry", "click here", "free entry"])
+
+    assert hashes.dtype == np.uint64
+    assert hashes[0] == hashes[2]
+    assert hashes[0] != hashes[1]
+
+
+def test_count_min_sketch_never_undercounts():
+    rng = np.random.default_rng(0)
+    items = [f"gram{i}" for i in rng.integers(0, 500, size=5000)]
+
+    # a deliberately narrow sketch, so that collisions are guaranteed
+    sketch = CountMinSketch(width=256, depth=4)
+    sketch.add(hash_features(items))
+
+    unique, true_counts = np.unique(items, return_counts=True)
+    estimates = sketch.estimate(hash_features(unique))
+
+    assert sketch.total == len(items)
+    assert np.all(estimates >= true_counts)
+
+    # the error bound must hold for (nearly) all items
+    error, delta = sketch.error_bound()
+    assert error == (e / sketch.width) * sketch.total
+    assert delta == exp(-4)
+    assert np.mean(estimates - true_counts <= error) >= 1 - delta
+
+
+def test_count_min_sketch_exact_when_wide():
+    sketch = CountMinSketch(width=2**16, depth=4)
+    sketch.add(hash_features(["a b", "b c", "a b"]), np.array([1, 2, 3]))
+
+    assert list(sketch.estimate(hash_features(["a b", "b c", "c d"]))) == [4, 2, 0]
+    assert sketch.distinct_estimate() == 2
+
+
+def test_count_min_sketch_from_error_bound():
+    sketch = CountMinSketch.from_error_bound(epsilon=0.001, delta=0.01)
+
+    assert sketch.width == 2719
+    assert sketch.depth == 5
+
+
+def test_count_min_sketch_merge():
+    a = CountMinSketch(width=1024, depth=3)
+    b = CountMinSketch(width=1024, depth=3)
+    a.add(hash_features(["x y"]))
+    b.add(hash_features(["x y", "y z"]))
+
+    merged = CountMinSketch.merge([a, b])
+
+    assert merged.total == 3
+    assert list(merged.estimate(hash_features(["x y", "y z"]))) == [2, 1]
+
+    with raises(ValueError):
+        CountMinSketch.merge([a, CountMinSketch(width=512, depth=3)])
@@ -0,0 +1,80 @@
+from math import log
+
+import numpy as np
+from pytest import approx, raises
+
+from text_classifier.smoothing import sweep_smoothing
+
+from .utils import trained_classifier
+
+VALIDATION = [
+    ("lovely cat", "positive"),
+    ("awful awful weather", "negative"),
+    ("sunny dog day", "positive"),
+    ("hate rainy gabagool", "negative"),
+]
+
+
+def test_sweep_smoothing_matches_retrained_likelihoods():
+    c = trained_classifier()
+
+    ks = [0.1, 1.0, {"positive": 0.5, "negative": 2.0}]
+    sweep = sweep_smoothing(c, VALIDATION, ks)
+
+    assert sweep.ks.shape == (3, 2)
+
+    for i, k in enumerate(ks):
+        c.set_smoothing(k)
+
+        predictions = [c.predict(doc) for doc, _ in VALIDATION]
+        accuracy = np.mean(
+            [
+                max(p, key=p.__getitem__) == label
+                for p, (_, label) in zip(predictions, VALIDATION)
+            ]
+        )
+        log_loss = -np.mean(
+            [log(p[label]) for p, (_, label) in zip(predictions, VALIDATION)]
+        )
+
+        assert approx(sweep.accuracies[i]) == accuracy
+        assert approx(sweep.log_losses[i]) == log_loss
+
+
+def test_set_smoothing_per_category():
+    c = trained_classifier()
+
+    c.set_smoothing({"positive": 0.5, "negative": 2.0})
+
+    likelihoods = c.word_likelihoods_per_category
+    positive_total = c.total_words_for_category("positive")
+    vocab_size = len(c.vocabulary)
+
+    assert likelihoods["positive"].k == 0.5
+    assert likelihoods["negative"].k == 2.0
+    assert approx(likelihoods["positive"]["love"]) == (2 + 0.5) / (
+        positive_total + 0.5 * vocab_size
+    )
+
+
+def test_sweep_smoothing_best_k():
+    c = trained_classifier()
+
+    sweep = sweep_smoothing(c, VALIDATION, [0.01, 0.1, 1.0, 10.0])
+
+    assert sweep.best_k in [0.01, 0.1, 1.0, 10.0]
+    assert sweep.accuracies[sweep.best_index] == sweep.accuracies.max()
+
+
+def test_sweep_smoothing_empty_validation():
+    c = trained_classifier()
+
+    with raises(ValueError):
+        sweep_smoothing(c, [], [0.1, 1.0])
+
+
+def test_sweep_smoothing_rejects_ngram_classifier():
+    c = trained_classifier(ngram_size=2)
+
+    with raises(ValueError):
+        sweep_smoothing(c, VALIDATION, [0.1, 1.0])
@@ -1,5 +1,7 @@
 from spacy.lang.en.stop_words import STOP_WORDS
 
+from text_classifier.classifier import Classifier
+
 
 def filter_stop_words(words: list[str]) -> list[str]:
     """
@@ -16,3 +18,32 @@ def filter_stop_words(words: list[str]) -> list[str]:
         STOP_WORDS set.
     """
     return [i for i in words if i not in STOP_WORDS]
+
+
+# a small two-category training set shared by the classifier tests
+SAMPLE_DATASET = [
+    ("love my cat", "positive"),
+    ("love my dog", "positive"),
+    ("what a lovely sunny day", "positive"),
+    ("hate my cat", "negative"),
+    ("awful rainy day", "negative"),
+    ("i hate this awful dog", "negative"),
+]
+
+
+def trained_classifier(
+    dataset: list[tuple[str, str]] = SAMPLE_DATASET, **options
+) -> Classifier:
+    """
+    Helper function to create a classifier trained on a dataset.
+
+    Args:
+        dataset: the (text, label) pairs to train on, defaults to SAMPLE_DATASET
+        options: keyword arguments passed to the Classifier constructor
+
+    Returns:
+        the trained classifier
+    """
+    c = Classifier(**options)
+    c.train(dataset)
+    return c